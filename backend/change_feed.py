@@ -0,0 +1,182 @@
+"""
+Cross-worker change propagation for Liga Veteranos Logroño.
+
+Each API worker keeps in-process state (response cache versions, live score
+subscribers) that only sees the writes it handled itself. The ChangeFeed tails
+the watched collections and hands every change, normalized to
+
+    {"collection", "operation", "id", "document", "origin"}
+
+to local subscribers. `origin` is the `updated_by` stamp of the worker that
+made the write, so subscribers can skip changes they already applied.
+
+MongoDB change streams are used when available (replica sets), resuming from
+the last stored resume token after a restart. On a standalone mongod the feed
+falls back to polling each collection's `updated_at` index. Deletes leave
+nothing to poll for, so writers also record them with `record_deletion` in a
+per-collection marker document that the polling fallback tails.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# Every collection a cached response depends on
+WATCHED_COLLECTIONS = [
+    "fixtures", "copa_fixtures", "copa_brackets", "players", "teams", "sanctions",
+    "copa_groups", "instagram_posts", "standings",
+]
+
+# One marker document per watched collection, stamped on every delete
+DELETION_MARKERS = "_deletions"
+
+# Server error codes meaning change streams cannot be used or resumed
+CHANGE_STREAMS_UNSUPPORTED = {40573, 40324}  # not a replica set / unrecognized $changeStream stage
+CHANGE_STREAM_HISTORY_LOST = 286
+
+
+async def record_deletion(db, collection: str, document_id, stamp: dict):
+    """Make a delete visible to workers polling for changes."""
+    await db[DELETION_MARKERS].update_one(
+        {"_id": collection}, {"$set": {"collection": collection, "id": document_id, **stamp}}, upsert=True
+    )
+
+
+class ChangeFeed:
+    def __init__(self, db, name: str, mode: str = "auto", poll_seconds: float = 2.0):
+        self.db = db
+        self.name = name
+        self.mode = mode  # auto, stream, poll or off
+        self.poll_seconds = poll_seconds
+        self.subscribers = []
+        self.task = None
+
+    def subscribe(self, callback):
+        """Register a callback receiving each normalized change."""
+        self.subscribers.append(callback)
+
+    def start(self):
+        if self.mode != "off" and self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    def _dispatch(self, change: dict):
+        for callback in self.subscribers:
+            try:
+                callback(change)
+            except Exception:
+                logger.exception(f"Change subscriber failed for {change['collection']}")
+
+    async def _run(self):
+        try:
+            if self.mode in ("auto", "stream"):
+                try:
+                    await self._watch()
+                    return
+                except (OperationFailure, NotImplementedError) as error:
+                    code = getattr(error, "code", None)
+                    if self.mode == "stream" or (code is not None and code not in CHANGE_STREAMS_UNSUPPORTED):
+                        raise
+                    logger.info("Change streams unavailable, polling updated_at instead")
+            await self._poll()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Change feed stopped")
+
+    # ----- Change streams -----
+
+    async def _load_resume_token(self):
+        state = await self.db["_change_feed"].find_one({"_id": self.name})
+        return state.get("resume_token") if state else None
+
+    async def _save_resume_token(self, token):
+        await self.db["_change_feed"].update_one(
+            {"_id": self.name},
+            {"$set": {"resume_token": token, "updated_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+
+    async def _watch(self):
+        pipeline = [{"$match": {"ns.coll": {"$in": WATCHED_COLLECTIONS}}}]
+        resume_token = await self._load_resume_token()
+        while True:
+            try:
+                async with self.db.watch(pipeline, full_document="updateLookup", resume_after=resume_token) as stream:
+                    logger.info("Watching change stream" + (" from stored resume token" if resume_token else ""))
+                    async for event in stream:
+                        self._dispatch(self._normalize_event(event))
+                        resume_token = stream.resume_token
+                        await self._save_resume_token(resume_token)
+            except OperationFailure as error:
+                if error.code == CHANGE_STREAM_HISTORY_LOST and resume_token is not None:
+                    logger.warning("Stored resume token is no longer in the oplog, watching from now")
+                    resume_token = None
+                    continue
+                raise
+            except PyMongoError:
+                logger.exception("Change stream interrupted, resuming")
+                await asyncio.sleep(self.poll_seconds)
+
+    @staticmethod
+    def _normalize_event(event: dict) -> dict:
+        document = event.get("fullDocument")
+        if document is not None:
+            document = {k: v for k, v in document.items() if k != "_id"}
+        return {
+            "collection": event["ns"]["coll"],
+            "operation": event["operationType"],
+            "id": document.get("id") if document else None,
+            "document": document,
+            "origin": document.get("updated_by") if document else None,
+        }
+
+    # ----- Polling fallback -----
+
+    async def _poll(self):
+        last_seen = {name: datetime.now(timezone.utc) for name in [*WATCHED_COLLECTIONS, DELETION_MARKERS]}
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            for name in [*WATCHED_COLLECTIONS, DELETION_MARKERS]:
+                try:
+                    docs = await self.db[name].find(
+                        {"updated_at": {"$gt": last_seen[name]}}, {"_id": 0}
+                    ).sort("updated_at", 1).to_list(None)
+                except PyMongoError:
+                    logger.exception(f"Polling {name} failed")
+                    continue
+                for doc in docs:
+                    updated_at = doc["updated_at"]
+                    if updated_at.tzinfo is None:
+                        updated_at = updated_at.replace(tzinfo=timezone.utc)
+                    last_seen[name] = max(last_seen[name], updated_at)
+                    if name == DELETION_MARKERS:
+                        # Only the latest delete per collection is kept, which is
+                        # enough for subscribers that invalidate whole collections
+                        self._dispatch({
+                            "collection": doc["collection"],
+                            "operation": "delete",
+                            "id": doc.get("id"),
+                            "document": None,
+                            "origin": doc.get("updated_by"),
+                        })
+                        continue
+                    self._dispatch({
+                        "collection": name,
+                        "operation": "update",
+                        "id": doc.get("id"),
+                        "document": doc,
+                        "origin": doc.get("updated_by"),
+                    })
@@ -0,0 +1,376 @@
+"""
+Append-only match event ledger for Liga Veteranos Logroño.
+
+Every goal and card added to a Liga fixture, Copa group fixture or Copa
+bracket is appended to `match_events`; removing one appends a voiding entry
+with `delta: -1` instead of deleting anything. Ledger entries are keyed by
+(event_id, delta), which makes appends idempotent.
+
+Player counters (goals_scored, yellow_cards, red_cards) follow the ledger: each
+append $inc's them by the entries it actually inserted, so a retried write
+never counts twice. `refresh_player_totals` re-derives them from the whole
+ledger for backfills.
+
+`reconcile` repairs drift between the fixture arrays, the ledger, the player
+counters and the sanctions view built from the card counters. It is safe to
+run alongside the API and resumes from its checkpoint in `_reconcile` if
+interrupted.
+"""
+
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+# Fixture collection holding each competition's goal and card arrays
+COMPETITION_COLLECTIONS = {"liga": "fixtures", "copa": "copa_fixtures", "bracket": "copa_brackets"}
+
+PLAYER_COUNTERS = {"goal": "goals_scored", "yellow": "yellow_cards", "red": "red_cards"}
+
+DUPLICATE_KEY = 11000
+
+RECONCILE_BATCH_SIZE = 500
+
+# Compare-and-set rounds before leaving a contended counter to reconcile
+REFRESH_ATTEMPTS = 5
+
+
+def match_event(competition: str, fixture_id: str, team_side: str, item: dict, delta: int = 1) -> dict:
+    """Ledger entry for a goal or card as stored in a fixture's arrays."""
+    return {
+        "event_id": item["id"],
+        "competition": competition,
+        "fixture_id": fixture_id,
+        "team_side": team_side,
+        "player_id": item["player_id"],
+        "type": item.get("card_type", "goal"),
+        "minute": item.get("minute"),
+        "delta": delta,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+def fixture_events(competition: str, fixture: dict) -> List[dict]:
+    """Ledger entries for every goal and card currently on a fixture."""
+    events = []
+    for side in ("home", "away"):
+        for field in (f"{side}_scorers", f"{side}_cards"):
+            for item in fixture.get(field) or []:
+                events.append(match_event(competition, fixture["id"], side, item))
+    return events
+
+
+def with_additions(events: List[dict]) -> List[dict]:
+    """
+    Pair each voiding entry with the addition it cancels. Add routes push to the
+    fixture before appending, so a failure in between leaves an item with no +1;
+    appending it alongside the -1 (a duplicate when it exists) makes removing
+    that item net to zero instead of going negative.
+    """
+    entries = []
+    for event in events:
+        if event["delta"] < 0:
+            entries.append({**event, "delta": 1})
+        entries.append(event)
+    return entries
+
+
+async def append_events(db, events: List[dict]) -> List[dict]:
+    """Append entries to the ledger and return those not already recorded."""
+    if not events:
+        return []
+    try:
+        await db.match_events.insert_many(events, ordered=False)
+        return events
+    except BulkWriteError as error:
+        if any(e["code"] != DUPLICATE_KEY for e in error.details["writeErrors"]):
+            raise
+        duplicates = {e["index"] for e in error.details["writeErrors"]}
+        return [event for index, event in enumerate(events) if index not in duplicates]
+
+
+async def apply_events(db, events: List[dict], stamp: Optional[dict] = None) -> int:
+    """Append entries and $inc the players' counters by the ones inserted."""
+    increments = {}
+    for event in await append_events(db, with_additions(events)):
+        counters = increments.setdefault(event["player_id"], {})
+        counter = PLAYER_COUNTERS[event["type"]]
+        counters[counter] = counters.get(counter, 0) + event["delta"]
+
+    operations = []
+    for player_id, counters in increments.items():
+        inc = {counter: value for counter, value in counters.items() if value}
+        if inc:
+            operations.append(UpdateOne({"id": player_id}, {"$inc": inc, **({"$set": stamp} if stamp else {})}))
+    if operations:
+        await db.players.bulk_write(operations, ordered=False)
+    return len(operations)
+
+
+async def player_totals(db, player_ids: Optional[Iterable[str]] = None) -> dict:
+    """Counters per player as derived from the ledger."""
+    pipeline = []
+    if player_ids is not None:
+        pipeline.append({"$match": {"player_id": {"$in": list(player_ids)}}})
+    pipeline.append({
+        "$group": {
+            "_id": "$player_id",
+            **{
+                counter: {"$sum": {"$cond": [{"$eq": ["$type", event_type]}, "$delta", 0]}}
+                for event_type, counter in PLAYER_COUNTERS.items()
+            },
+        }
+    })
+    return {
+        row["_id"]: {counter: row[counter] for counter in PLAYER_COUNTERS.values()}
+        async for row in db.match_events.aggregate(pipeline)
+    }
+
+
+async def refresh_player_totals(db, player_ids: Optional[Iterable[str]] = None, stamp: Optional[dict] = None) -> int:
+    """Write ledger-derived counters onto the given players, or onto every player."""
+    if player_ids is not None:
+        player_ids = list(set(player_ids))
+        if not player_ids:
+            return 0
+        query = {"id": {"$in": player_ids}}
+    else:
+        query = {}
+    zero = {counter: 0 for counter in PLAYER_COUNTERS.values()}
+
+    corrected = 0
+    for _ in range(REFRESH_ATTEMPTS):
+        # Counters are read before the ledger, so a write matching them saw every earlier append
+        players = await db.players.find(query, {"_id": 0, "id": 1, **{counter: 1 for counter in zero}}).to_list(None)
+        totals = await player_totals(db, player_ids)
+        operations = []
+        for player in players:
+            current = {counter: player.get(counter, 0) for counter in zero}
+            expected = totals.get(player["id"], zero)
+            if current != expected:
+                operations.append(UpdateOne({"id": player["id"], **current}, {"$set": {**expected, **(stamp or {})}}))
+        if not operations:
+            return corrected
+        result = await db.players.bulk_write(operations, ordered=False)
+        corrected += result.modified_count
+        if result.matched_count == len(operations):
+            return corrected
+    logger.warning(f"Player totals still contended after {REFRESH_ATTEMPTS} attempts, leaving them to reconcile")
+    return corrected
+
+
+async def refresh_sanction_rows(db, player_ids: Optional[List[str]] = None, stamp: Optional[dict] = None) -> int:
+    """
+    Upsert the sanctions view for the given players, or for every player who is
+    carded or still has a row, so counters corrected down to zero are written too.
+    """
+    if player_ids is None:
+        query = {"$or": [
+            {"yellow_cards": {"$gt": 0}},
+            {"red_cards": {"$gt": 0}},
+            {"id": {"$in": await db.sanctions.distinct("player_id")}},
+        ]}
+    else:
+        query = {"id": {"$in": list(player_ids)}}
+    players = await db.players.find(
+        query, {"_id": 0, "id": 1, "name": 1, "team_id": 1, "yellow_cards": 1, "red_cards": 1}
+    ).to_list(None)
+
+    team_ids = list({player["team_id"] for player in players})
+    teams = await db.teams.find({"id": {"$in": team_ids}}, {"_id": 0, "id": 1, "name": 1, "division": 1}).to_list(None)
+    teams_by_id = {team["id"]: team for team in teams}
+
+    now = datetime.now(timezone.utc)
+    operations = []
+    for player in players:
+        team = teams_by_id.get(player["team_id"])
+        if not team:
+            continue
+        yellow_cards = player.get("yellow_cards", 0)
+        red_cards = player.get("red_cards", 0)
+        operations.append(UpdateOne(
+            {"player_id": player["id"]},
+            {
+                "$set": {
+                    "player_name": player["name"],
+                    "team_id": player["team_id"],
+                    "team_name": team["name"],
+                    "division": team.get("division", 1),
+                    "card_type": "red" if red_cards > 0 else "yellow",
+                    "total_yellow_cards": yellow_cards,
+                    "total_red_cards": red_cards,
+                    "updated_at": now,
+                    **(stamp or {}),
+                },
+                "$setOnInsert": {"id": str(uuid.uuid4()), "created_at": now},
+            },
+            upsert=True
+        ))
+
+    if operations:
+        await db.sanctions.bulk_write(operations, ordered=False)
+    return len(operations)
+
+
+# ----- Reconciliation -----
+
+def _fixture_events_stage(competition: str) -> List[dict]:
+    """Pipeline stages turning a collection's fixtures into one document per goal or card."""
+    def items(field: str, side: str, event_type):
+        return {
+            "$map": {
+                "input": {"$ifNull": [f"${field}", []]},
+                "as": "item",
+                "in": {
+                    "event_id": "$$item.id",
+                    "player_id": "$$item.player_id",
+                    "type": event_type,
+                    "minute": "$$item.minute",
+                    "team_side": side,
+                    "fixture_id": "$id",
+                    "competition": competition,
+                },
+            }
+        }
+    return [
+        {"$project": {"_id": 0, "events": {"$concatArrays": [
+            items(f"{side}_{kind}", side, "goal" if kind == "scorers" else "$$item.card_type")
+            for side in ("home", "away") for kind in ("scorers", "cards")
+        ]}}},
+        {"$unwind": "$events"},
+        {"$replaceRoot": {"newRoot": "$events"}},
+    ]
+
+
+async def recorded_fixture_events(db) -> dict:
+    """Every goal and card currently on a fixture, keyed by event id, in one aggregation."""
+    competitions = list(COMPETITION_COLLECTIONS.items())
+    first_competition, first_collection = competitions[0]
+    pipeline = _fixture_events_stage(first_competition)
+    for competition, name in competitions[1:]:
+        pipeline.append({"$unionWith": {"coll": name, "pipeline": _fixture_events_stage(competition)}})
+    return {event["event_id"]: event async for event in db[first_collection].aggregate(pipeline)}
+
+
+async def ledger_balances(db) -> dict:
+    """Net delta and details of every event in the ledger, keyed by event id."""
+    pipeline = [{
+        "$group": {
+            "_id": "$event_id",
+            "balance": {"$sum": "$delta"},
+            "player_id": {"$first": "$player_id"},
+            "type": {"$first": "$type"},
+            "competition": {"$first": "$competition"},
+            "fixture_id": {"$first": "$fixture_id"},
+            "team_side": {"$first": "$team_side"},
+        }
+    }]
+    return {row["_id"]: row async for row in db.match_events.aggregate(pipeline)}
+
+
+async def _on_fixture(db, competition: str, fixture_id: str, event_id: str) -> bool:
+    """Whether a goal or card is on its fixture right now."""
+    collection = db[COMPETITION_COLLECTIONS[competition]]
+    query = {"id": fixture_id, "$or": [
+        {f"{side}_{kind}.id": event_id} for side in ("home", "away") for kind in ("scorers", "cards")
+    ]}
+    return await collection.count_documents(query, limit=1) > 0
+
+
+async def reconcile(db, stamp: Optional[dict] = None, batch_size: int = RECONCILE_BATCH_SIZE) -> dict:
+    """
+    Bring the ledger in line with the fixture arrays, then correct player
+    counters that differ from the ledger. Returns how much was corrected.
+    """
+    checkpoints = db["_reconcile"]
+    state = await checkpoints.find_one({"_id": "players"}) or {}
+    last_player_id = state.get("last_player_id") if state.get("running") else None
+    report = dict(state.get("report", {})) if last_player_id else {}
+    if last_player_id:
+        logger.info(f"Resuming reconciliation after player {last_player_id}")
+    else:
+        # Appends are idempotent, so a resumed run can repeat this phase safely.
+        # The ledger is read first: the API pushes to a fixture before appending,
+        # so every recorded event was already on its fixture when it was read.
+        balances = await ledger_balances(db)
+        on_fixtures = await recorded_fixture_events(db)
+        # Each event should balance to 1 while it is on a fixture and to 0 once it is not
+        now = datetime.now(timezone.utc)
+
+        def ledger_entry(event_id: str, row: dict, delta: int) -> dict:
+            return {
+                "event_id": event_id, "competition": row["competition"], "fixture_id": row["fixture_id"],
+                "team_side": row["team_side"], "player_id": row["player_id"], "type": row["type"],
+                "minute": None, "delta": delta, "created_at": now,
+            }
+
+        missing = [
+            {**event, "delta": 1, "created_at": now}
+            for event_id, event in on_fixtures.items()
+            if balances.get(event_id, {}).get("balance", 0) < 1
+        ]
+        # A void whose addition was never recorded left the balance at -1
+        missing += [
+            ledger_entry(event_id, row, 1)
+            for event_id, row in balances.items()
+            if row["balance"] < 0 and event_id not in on_fixtures
+        ]
+        stale = [
+            ledger_entry(event_id, row, -1)
+            for event_id, row in balances.items()
+            if row["balance"] > 0 and event_id not in on_fixtures
+            and not await _on_fixture(db, row["competition"], row["fixture_id"], event_id)
+        ]
+        report = {
+            "events_added": len(await append_events(db, missing)),
+            "events_voided": len(await append_events(db, stale)),
+            "players_corrected": 0,
+        }
+        await checkpoints.update_one(
+            {"_id": "players"},
+            {"$set": {"running": True, "last_player_id": None, "report": report, "started_at": now}},
+            upsert=True
+        )
+
+    zero = {counter: 0 for counter in PLAYER_COUNTERS.values()}
+    while True:
+        query = {"id": {"$gt": last_player_id}} if last_player_id else {}
+        players = await db.players.find(
+            query, {"_id": 0, "id": 1, **{counter: 1 for counter in zero}}
+        ).sort("id", 1).limit(batch_size).to_list(None)
+        if not players:
+            break
+        totals = await player_totals(db, [player["id"] for player in players])
+        operations = []
+        corrected_ids = []
+        for player in players:
+            current = {counter: player.get(counter, 0) for counter in zero}
+            expected = totals.get(player["id"], zero)
+            if current != expected:
+                # Only overwrite the values read, so a concurrent write wins
+                operations.append(UpdateOne({"id": player["id"], **current}, {"$set": {**expected, **(stamp or {})}}))
+                corrected_ids.append(player["id"])
+        if operations:
+            result = await db.players.bulk_write(operations, ordered=False)
+            report["players_corrected"] += result.modified_count
+            # Card totals feed the sanctions view, including counters corrected down to zero
+            await refresh_sanction_rows(db, corrected_ids, stamp)
+        last_player_id = players[-1]["id"]
+        await checkpoints.update_one(
+            {"_id": "players"}, {"$set": {"last_player_id": last_player_id, "report": report}}
+        )
+
+    await checkpoints.update_one(
+        {"_id": "players"},
+        {"$set": {"running": False, "last_player_id": None, "report": report, "finished_at": datetime.now(timezone.utc)}}
+    )
+    logger.info(
+        f"Reconciled match events: {report['events_added']} added, {report['events_voided']} voided, "
+        f"{report['players_corrected']} players corrected"
+    )
+    return report
@@ -0,0 +1,279 @@
+"""
+Versioned database migrations for Liga Veteranos Logroño.
+
+Migrations run in order at API startup and can also be applied by hand:
+
+    python migrations.py migrate       # apply pending migrations
+    python migrations.py status        # list applied and pending versions
+    python migrations.py index-usage   # per-index usage counters ($indexStats)
+    python migrations.py reconcile     # repair player goal and card totals
+
+Every migration is idempotent, and applied versions are recorded in the
+`_migrations` collection.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
+
+from change_feed import WATCHED_COLLECTIONS
+from match_events import (
+    COMPETITION_COLLECTIONS, append_events, fixture_events, reconcile, refresh_player_totals, refresh_sanction_rows
+)
+
+logger = logging.getLogger(__name__)
+
+# Collections whose index usage is reported
+INDEXED_COLLECTIONS = [
+    "users", "teams", "players", "fixtures", "standings", "subscriptions", "instagram_posts",
+    "copa_groups", "copa_fixtures", "copa_brackets", "sanctions", "match_events",
+]
+
+
+async def _drop_duplicates(collection, field: str):
+    """Keep the first document per value of `field` so a unique index can be built."""
+    pipeline = [
+        {"$group": {"_id": f"${field}", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    async for group in collection.aggregate(pipeline):
+        await collection.delete_many({"_id": {"$in": group["ids"][1:]}})
+        logger.warning(f"Removed {group['count'] - 1} duplicate {collection.name} documents for {field}={group['_id']}")
+
+
+async def create_initial_indexes(db):
+    await _drop_duplicates(db.sanctions, "player_id")
+    await _drop_duplicates(db.standings, "team_id")
+
+    await db.users.create_indexes([
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("username", ASCENDING)], unique=True),
+    ])
+    await db.teams.create_indexes([
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("division", ASCENDING)]),
+    ])
+    await db.players.create_indexes([
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("team_id", ASCENDING)]),
+        IndexModel([("goals_scored", DESCENDING), ("name", ASCENDING), ("id", ASCENDING)]),
+    ])
+    await db.fixtures.create_indexes([
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("division", ASCENDING), ("status", ASCENDING)]),
+        IndexModel([("division", ASCENDING), ("week_number", ASCENDING)]),
+        IndexModel([("week_number", ASCENDING)]),
+    ])
+    await db.standings.create_indexes([
+        IndexModel([("team_id", ASCENDING)], unique=True),
+        IndexModel([("division", ASCENDING), ("points", DESCENDING), ("goal_difference", DESCENDING)]),
+    ])
+    await db.subscriptions.create_indexes([
+        IndexModel([("email", ASCENDING), ("season", ASCENDING)]),
+    ])
+    await db.instagram_posts.create_indexes([
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("created_at", DESCENDING)]),
+    ])
+    await db.copa_groups.create_indexes([
+        IndexModel([("group_name", ASCENDING)], unique=True),
+    ])
+    await db.copa_fixtures.create_indexes([
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("group_name", ASCENDING), ("status", ASCENDING)]),
+        IndexModel([("status", ASCENDING)]),
+    ])
+    await db.copa_brackets.create_indexes([
+        IndexModel([("id", ASCENDING)], unique=True),
+    ])
+    await db.sanctions.create_indexes([
+        IndexModel([("player_id", ASCENDING)], unique=True),
+        IndexModel([("team_id", ASCENDING)]),
+    ])
+
+
+# Date fields that older versions of the API stored as ISO strings
+DATE_FIELDS = {
+    "users": ["created_at"],
+    "teams": ["created_at"],
+    "players": ["created_at"],
+    "fixtures": ["match_date", "updated_at"],
+    "subscriptions": ["created_at", "expires_at"],
+    "instagram_posts": ["created_at"],
+    "copa_groups": ["created_at"],
+    "copa_fixtures": ["match_date", "updated_at"],
+    "copa_brackets": ["match_date", "created_at", "updated_at"],
+    "sanctions": ["created_at", "updated_at"],
+}
+
+MIGRATION_BATCH_SIZE = 500
+
+
+async def convert_string_dates(db):
+    """Rewrite ISO string dates as BSON datetimes, in bulk batches."""
+    for name, fields in DATE_FIELDS.items():
+        collection = db[name]
+        query = {"$or": [{field: {"$type": "string"}} for field in fields]}
+        projection = {field: 1 for field in fields}
+        converted = 0
+        batch = []
+        async for doc in collection.find(query, projection):
+            update = {}
+            for field in fields:
+                value = doc.get(field)
+                if not isinstance(value, str):
+                    continue
+                try:
+                    update[field] = datetime.fromisoformat(value)
+                except ValueError:
+                    logger.warning(f"Leaving unparseable {name}.{field} {value!r} on {doc['_id']}")
+            if update:
+                batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": update}))
+            if len(batch) >= MIGRATION_BATCH_SIZE:
+                await collection.bulk_write(batch, ordered=False)
+                converted += len(batch)
+                batch = []
+        if batch:
+            await collection.bulk_write(batch, ordered=False)
+            converted += len(batch)
+        if converted:
+            logger.info(f"Converted dates on {converted} {name} documents")
+
+    await db.fixtures.create_index([("match_date", ASCENDING)])
+    await db.copa_fixtures.create_index([("match_date", ASCENDING)])
+
+
+async def create_pagination_indexes(db):
+    await db.fixtures.create_index([("week_number", ASCENDING), ("id", ASCENDING)])
+    await db.players.create_index([("name", ASCENDING), ("id", ASCENDING)])
+    await db.players.create_index([("team_id", ASCENDING), ("name", ASCENDING), ("id", ASCENDING)])
+    await db.users.create_index([("username", ASCENDING), ("id", ASCENDING)])
+
+
+async def create_change_feed_indexes(db):
+    # Used by the change feed's polling fallback
+    for name in WATCHED_COLLECTIONS:
+        await db[name].create_index([("updated_at", ASCENDING)])
+
+
+async def create_match_event_ledger(db):
+    """Backfill match_events from the goals and cards already on fixtures."""
+    await db.match_events.create_indexes([
+        IndexModel([("event_id", ASCENDING), ("delta", ASCENDING)], unique=True),
+        IndexModel([("fixture_id", ASCENDING)]),
+        IndexModel([("player_id", ASCENDING), ("type", ASCENDING)]),
+        IndexModel([("competition", ASCENDING), ("type", ASCENDING)]),
+    ])
+    projection = {"_id": 0, "id": 1, "home_scorers": 1, "away_scorers": 1, "home_cards": 1, "away_cards": 1}
+    for competition, name in COMPETITION_COLLECTIONS.items():
+        recorded = 0
+        batch = []
+        async for fixture in db[name].find({}, projection):
+            batch.extend(fixture_events(competition, fixture))
+            if len(batch) >= MIGRATION_BATCH_SIZE:
+                recorded += len(await append_events(db, batch))
+                batch = []
+        recorded += len(await append_events(db, batch))
+        if recorded:
+            logger.info(f"Recorded {recorded} {competition} match events")
+
+    corrected = await refresh_player_totals(db)
+    if corrected:
+        logger.info(f"Corrected goal and card totals on {corrected} players")
+        await refresh_sanction_rows(db)
+
+
+async def create_team_fixture_indexes(db):
+    # Each branch of the team dashboard's $or uses its own index
+    await db.fixtures.create_index([("home_team_id", ASCENDING), ("match_date", ASCENDING)])
+    await db.fixtures.create_index([("away_team_id", ASCENDING), ("match_date", ASCENDING)])
+
+
+# (version, description, coroutine taking the database)
+MIGRATIONS = [
+    (1, "Create initial indexes", create_initial_indexes),
+    (2, "Store dates as BSON datetimes", convert_string_dates),
+    (3, "Create keyset pagination indexes", create_pagination_indexes),
+    (4, "Create updated_at indexes for the change feed", create_change_feed_indexes),
+    (5, "Backfill the match event ledger", create_match_event_ledger),
+    (6, "Create team fixture indexes", create_team_fixture_indexes),
+    (7, "Create updated_at indexes for newly watched collections", create_change_feed_indexes),
+]
+
+
+async def applied_versions(db) -> set:
+    return {doc["_id"] async for doc in db["_migrations"].find({}, {"_id": 1})}
+
+
+async def run_migrations(db) -> list:
+    """Apply every pending migration in order and return the versions applied."""
+    done = await applied_versions(db)
+    applied = []
+    for version, description, migrate in MIGRATIONS:
+        if version in done:
+            continue
+        logger.info(f"Applying migration {version}: {description}")
+        await migrate(db)
+        await db["_migrations"].update_one(
+            {"_id": version},
+            {"$set": {"description": description, "applied_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+        applied.append(version)
+    return applied
+
+
+async def index_usage(db) -> dict:
+    """Usage counters for every index, keyed by collection name."""
+    usage = {}
+    for name in INDEXED_COLLECTIONS:
+        stats = await db[name].aggregate([{"$indexStats": {}}]).to_list(None)
+        usage[name] = [
+            {
+                "name": stat["name"],
+                "key": dict(stat["key"]),
+                "ops": stat["accesses"]["ops"],
+                "since": stat["accesses"]["since"],
+            }
+            for stat in stats
+        ]
+    return usage
+
+
+async def main(command: str):
+    load_dotenv(Path(__file__).parent / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+    try:
+        if command == "migrate":
+            applied = await run_migrations(db)
+            print(f"Applied migrations: {applied}" if applied else "Database is up to date")
+        elif command == "status":
+            done = await applied_versions(db)
+            for version, description, _ in MIGRATIONS:
+                print(f"{'applied' if version in done else 'pending':8} {version:4} {description}")
+        elif command == "index-usage":
+            for name, stats in (await index_usage(db)).items():
+                print(name)
+                for stat in sorted(stats, key=lambda s: s["ops"], reverse=True):
+                    print(f"  {stat['ops']:>10}  {stat['name']}  {stat['key']}")
+        elif command == "reconcile":
+            report = await reconcile(db, stamp={"updated_at": datetime.now(timezone.utc)})
+            print(f"Events added: {report['events_added']}, voided: {report['events_voided']}, "
+                  f"players corrected: {report['players_corrected']}")
+        else:
+            raise SystemExit(f"Unknown command: {command}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else "migrate"))
@@ -1,17 +1,32 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReplaceOne, ReturnDocument, UpdateOne
 import os
+import asyncio
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional
+from pydantic import AfterValidator, BaseModel, BeforeValidator, Field, ConfigDict, EmailStr, TypeAdapter, create_model
+from typing import Annotated, Dict, List, Literal, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import functools
+import hashlib
+import json
+import inspect
+import time
 import uuid
 from datetime import datetime, timezone, timedelta
 from passlib.context import CryptContext
 from jose import JWTError, jwt
+from change_feed import ChangeFeed, record_deletion
+from match_events import apply_events, fixture_events, match_event, reconcile, refresh_sanction_rows
+from migrations import run_migrations, index_usage
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -21,8 +36,9 @@ mongo_url = os.environ['MONGO_URL']
 client = AsyncIOMotorClient(mongo_url)
 db = client[os.environ['DB_NAME']]
 
-# Create the main app without a prefix
-app = FastAPI()
+# Create the main app without a prefix; responses not already serialized by
+# cached_response/fast_response are encoded with orjson
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -34,15 +50,53 @@ SECRET_KEY = os.environ.get("SECRET_KEY", "your-secret-key-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
+# bcrypt runs in its own thread pool so logins don't block the event loop
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", "4"))
+password_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+password_hash_semaphore = asyncio.Semaphore(PASSWORD_HASH_WORKERS)
+
+# Largest page a list route returns; also the default page size
+MAX_PAGE_SIZE = int(os.environ.get("MAX_PAGE_SIZE", "1000"))
+
+# Live score feed
+LIVE_QUEUE_SIZE = int(os.environ.get("LIVE_QUEUE_SIZE", "100"))
+LIVE_KEEPALIVE_SECONDS = 15
+
+# Response cache
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+
+# Authenticated user cache
+USER_CACHE_MAX_ENTRIES = int(os.environ.get("USER_CACHE_MAX_ENTRIES", "1024"))
+USER_CACHE_TTL_SECONDS = float(os.environ.get("USER_CACHE_TTL_SECONDS", "60"))
+
+# Cross-worker change feed: auto, stream, poll or off
+CHANGE_FEED_MODE = os.environ.get("CHANGE_FEED", "auto")
+CHANGE_FEED_NAME = os.environ.get("CHANGE_FEED_NAME", "default")
+CHANGE_FEED_POLL_SECONDS = float(os.environ.get("CHANGE_FEED_POLL_SECONDS", "2"))
+
+# Player counter reconciliation; 0 disables the periodic run
+RECONCILE_INTERVAL_SECONDS = float(os.environ.get("RECONCILE_INTERVAL_SECONDS", str(24 * 60 * 60)))
+
 # ============= Models =============
 
+# Dates are stored as BSON datetimes, which come back from MongoDB as naive UTC.
+# Audit timestamps are re-tagged as UTC; match dates are wall-clock times and
+# stay naive, as they were entered.
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+UTCDateTime = Annotated[datetime, AfterValidator(_as_utc)]
+
+# Optional match dates left blank in the admin forms arrive as empty strings
+OptionalMatchDate = Annotated[Optional[datetime], BeforeValidator(lambda value: value or None)]
+
 class User(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     username: str
     role: str  # admin or team
     team_id: Optional[str] = None
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: UTCDateTime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class UserCreate(BaseModel):
     username: str
@@ -65,7 +119,7 @@ class Team(BaseModel):
     name: str
     division: int  # 1 or 2
     logo_url: Optional[str] = None
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: UTCDateTime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class TeamCreate(BaseModel):
     name: str
@@ -81,7 +135,7 @@ class Player(BaseModel):
     goals_scored: int = 0
     yellow_cards: int = 0
     red_cards: int = 0
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: UTCDateTime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class PlayerCreate(BaseModel):
     name: str
@@ -116,26 +170,38 @@ class Fixture(BaseModel):
     away_scorers: List[GoalScorer] = []
     home_cards: List[Card] = []
     away_cards: List[Card] = []
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: UTCDateTime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class FixtureCreate(BaseModel):
     division: int
     week_number: int
     home_team_id: str
     away_team_id: str
-    match_date: str
+    match_date: datetime
 
-class FixtureCreateBulk(BaseModel):
+class BulkFixture(BaseModel):
+    home_team_id: str
+    away_team_id: str
+    match_date: datetime
+
+class FixtureWeek(BaseModel):
     division: int
     week_number: int
-    fixtures: List[dict]  # [{home_team_id, away_team_id, match_date}]
+    fixtures: List[BulkFixture]
+
+class FixtureCreateBulk(BaseModel):
+    # A single week at the top level, further weeks (of any division) in `weeks`
+    division: Optional[int] = None
+    week_number: Optional[int] = None
+    fixtures: List[BulkFixture] = []
+    weeks: List[FixtureWeek] = []
 
 class FixtureUpdate(BaseModel):
     home_score: Optional[int] = None
     away_score: Optional[int] = None
     status: Optional[str] = None
     week_number: Optional[int] = None
-    match_date: Optional[str] = None
+    match_date: Optional[datetime] = None
 
 class AddGoalScorer(BaseModel):
     player_id: str
@@ -148,6 +214,13 @@ class AddCard(BaseModel):
     card_type: str  # yellow or red
     minute: Optional[int] = None
 
+class MatchSheet(BaseModel):
+    home_score: Optional[int] = None
+    away_score: Optional[int] = None
+    status: Optional[str] = None
+    scorers: List[AddGoalScorer] = []
+    cards: List[AddCard] = []
+
 class RemoveGoalScorer(BaseModel):
     goal_id: str
     team_side: str
@@ -156,6 +229,32 @@ class RemoveCard(BaseModel):
     card_id: str
     team_side: str
 
+# Team display fields embedded by ?expand=teams
+class TeamNames(BaseModel):
+    home_team_name: Optional[str] = None
+    away_team_name: Optional[str] = None
+    home_team_logo: Optional[str] = None
+    away_team_logo: Optional[str] = None
+
+class FixtureWithTeams(TeamNames, Fixture):
+    pass
+
+class TeamDashboard(BaseModel):
+    team: Team
+    fixtures: List[FixtureWithTeams]
+    roster: List[Player]
+    next_match: Optional[FixtureWithTeams] = None
+    last_match: Optional[FixtureWithTeams] = None
+
+class MatchRosters(BaseModel):
+    home_team: Optional[Team] = None
+    away_team: Optional[Team] = None
+    home_roster: List[Player] = []
+    away_roster: List[Player] = []
+
+class FixtureDetail(MatchRosters):
+    fixture: Fixture
+
 class StandingsRow(BaseModel):
     position: int
     team_id: str
@@ -184,8 +283,8 @@ class Subscription(BaseModel):
     payment_status: str = "pending"  # pending or completed
     amount: float = 5.0
     season: str
-    expires_at: datetime
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    expires_at: UTCDateTime
+    created_at: UTCDateTime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class SubscriptionCreate(BaseModel):
     email: EmailStr
@@ -196,7 +295,7 @@ class InstagramPost(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     instagram_url: str
     description: Optional[str] = None
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: UTCDateTime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class InstagramPostCreate(BaseModel):
     instagram_url: str
@@ -208,7 +307,7 @@ class CopaGroup(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     group_name: str  # A, B, C, or D
     team_ids: List[str] = []
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: UTCDateTime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class CopaGroupCreate(BaseModel):
     group_name: str
@@ -229,21 +328,21 @@ class CopaFixture(BaseModel):
     away_scorers: List[GoalScorer] = []
     home_cards: List[Card] = []
     away_cards: List[Card] = []
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: UTCDateTime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class CopaFixtureCreate(BaseModel):
     group_name: str
     jornada: int
     home_team_id: str
     away_team_id: str
-    match_date: str
+    match_date: datetime
 
 class CopaFixtureUpdate(BaseModel):
     home_score: Optional[int] = None
     away_score: Optional[int] = None
     status: Optional[str] = None
     jornada: Optional[int] = None
-    match_date: Optional[str] = None
+    match_date: Optional[datetime] = None
 
 class CopaBracket(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -261,15 +360,15 @@ class CopaBracket(BaseModel):
     away_scorers: List[GoalScorer] = []
     home_cards: List[Card] = []
     away_cards: List[Card] = []
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: UTCDateTime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: UTCDateTime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class CopaBracketCreate(BaseModel):
     round_type: str
     match_position: int
     home_team_id: Optional[str] = None
     away_team_id: Optional[str] = None
-    match_date: Optional[str] = None
+    match_date: OptionalMatchDate = None
 
 class CopaBracketUpdate(BaseModel):
     home_team_id: Optional[str] = None
@@ -277,9 +376,21 @@ class CopaBracketUpdate(BaseModel):
     home_score: Optional[int] = None
     away_score: Optional[int] = None
     status: Optional[str] = None
-    match_date: Optional[str] = None
+    match_date: OptionalMatchDate = None
     winner_team_id: Optional[str] = None
 
+class CopaFixtureDetail(MatchRosters):
+    fixture: CopaFixture
+
+class CopaBracketDetail(MatchRosters):
+    fixture: CopaBracket
+
+class CopaFixtureWithTeams(TeamNames, CopaFixture):
+    pass
+
+class CopaBracketWithTeams(TeamNames, CopaBracket):
+    pass
+
 class CopaStandingsRow(BaseModel):
     position: int
     team_id: str
@@ -309,8 +420,8 @@ class Sanction(BaseModel):
     suspension_from_week: Optional[int] = None  # Starting week of suspension
     suspension_to_week: Optional[int] = None  # Ending week of suspension
     notes: Optional[str] = None
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: UTCDateTime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: UTCDateTime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class SanctionUpdate(BaseModel):
     suspension_games: Optional[int] = None
@@ -320,11 +431,48 @@ class SanctionUpdate(BaseModel):
 
 # ============= Helper Functions =============
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+class PasswordHashMetrics:
+    """Time bcrypt calls spend waiting for a free hashing slot."""
+    
+    def __init__(self):
+        self.calls = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.waiting = 0
+    
+    def record_wait(self, seconds: float):
+        self.calls += 1
+        self.total_wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+    
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "waiting": self.waiting,
+            "avg_wait_ms": round(self.total_wait_seconds / self.calls * 1000, 3) if self.calls else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+        }
+
+password_hash_metrics = PasswordHashMetrics()
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def run_password_hash(func, *args):
+    queued_at = time.monotonic()
+    password_hash_metrics.waiting += 1
+    try:
+        await password_hash_semaphore.acquire()
+    finally:
+        password_hash_metrics.waiting -= 1
+    try:
+        password_hash_metrics.record_wait(time.monotonic() - queued_at)
+        return await asyncio.get_running_loop().run_in_executor(password_hash_executor, func, *args)
+    finally:
+        password_hash_semaphore.release()
+
+async def verify_password(plain_password, hashed_password):
+    return await run_password_hash(pwd_context.verify, plain_password, hashed_password)
+
+async def get_password_hash(password):
+    return await run_password_hash(pwd_context.hash, password)
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -333,6 +481,40 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+class UserCache:
+    """Bounded TTL cache of authenticated users keyed by user id."""
+    
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()  # user id -> (expires_at, User)
+    
+    def get(self, user_id: str) -> Optional[User]:
+        entry = self.entries.get(user_id)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self.entries[user_id]
+            return None
+        self.entries.move_to_end(user_id)
+        return entry[1]
+    
+    def set(self, user: User):
+        if self.max_entries <= 0:
+            return
+        self.entries[user.id] = (time.monotonic() + self.ttl_seconds, user)
+        self.entries.move_to_end(user.id)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+    
+    def invalidate(self, user_id: str):
+        self.entries.pop(user_id, None)
+    
+    def clear(self):
+        self.entries.clear()
+
+user_cache = UserCache(USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS)
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
         token = credentials.credentials
@@ -341,14 +523,17 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
         
-        user_doc = await db.users.find_one({"id": user_id}, {"_id": 0})
+        user = user_cache.get(user_id)
+        if user is not None:
+            return user
+        
+        user_doc = await db.users.find_one({"id": user_id}, {"_id": 0, "hashed_password": 0})
         if user_doc is None:
             raise HTTPException(status_code=401, detail="User not found")
         
-        if isinstance(user_doc['created_at'], str):
-            user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
-        
-        return User(**user_doc)
+        user = User(**user_doc)
+        user_cache.set(user)
+        return user
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
 
@@ -357,6 +542,448 @@ async def get_admin_user(current_user: User = Depends(get_current_user)):
         raise HTTPException(status_code=403, detail="Admin access required")
     return current_user
 
+# ============= Response Cache =============
+# Public reads only change when an admin writes, so their serialized bodies are
+# cached in-process. Every collection carries a version counter that mutating
+# routes bump; an entry is only served while the versions it was built from
+# are still current. The same versions give each response a strong ETag, so
+# clients revalidating with If-None-Match get a 304 without any query.
+
+collection_versions = {}
+
+# Versions restart from zero with the process, so ETags are scoped to it
+VERSION_EPOCH = uuid.uuid4().hex
+
+def bump_versions(*collections):
+    for collection in collections:
+        collection_versions[collection] = collection_versions.get(collection, 0) + 1
+
+def current_versions(collections) -> tuple:
+    return tuple(collection_versions.get(collection, 0) for collection in collections)
+
+def make_etag(key, versions: tuple) -> str:
+    digest = hashlib.sha1(repr((VERSION_EPOCH, key, versions)).encode()).hexdigest()
+    return f'"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+class ResponseCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (versions, (body, headers))
+    
+    def get(self, key, versions: tuple) -> Optional[tuple]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] != versions:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry[1]
+    
+    def set(self, key, versions: tuple, value: tuple):
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = (versions, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+    
+    def clear(self):
+        self.entries.clear()
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES)
+
+@functools.lru_cache(maxsize=None)
+def response_adapter(response_type) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+def serialize_result(response_type, result) -> tuple:
+    """Validate and encode a route result in pydantic-core, returning (body, page headers)."""
+    page_headers = {}
+    if isinstance(result, Page):
+        page_headers = result.headers()
+        result = result.items
+    adapter = response_adapter(response_type)
+    return adapter.dump_json(adapter.validate_python(result)), page_headers
+
+def fast_response(response_type):
+    """
+    Serialize a route's result with a cached TypeAdapter and return the bytes
+    directly, skipping FastAPI's response_model validation and JSON encoding.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            result = await func(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+            body, page_headers = serialize_result(response_type, result)
+            return Response(content=body, media_type="application/json", headers=page_headers)
+        return wrapper
+    return decorator
+
+def cached_response(response_type, *collections, variant=None):
+    """
+    Serve a public GET from the response cache, keyed by route and parameters.
+    `variant`, given the route's parameters, may pick a different response
+    type for the request (expanded or trimmed list items).
+    """
+    
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, request: Request, **kwargs):
+            key = (func.__name__, tuple(sorted(kwargs.items())))
+            # Snapshot versions before querying so a concurrent write invalidates this entry
+            versions = current_versions(collections)
+            headers = {"ETag": make_etag(key, versions), "Cache-Control": "no-cache"}
+            if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+                return Response(status_code=304, headers=headers)
+            
+            cached = response_cache.get(key, versions)
+            if cached is None:
+                result = await func(*args, **kwargs)
+                if isinstance(result, Response):
+                    # Streamed bodies are produced on the fly and never cached
+                    return result
+                cached = serialize_result((variant(kwargs) if variant else None) or response_type, result)
+                response_cache.set(key, versions, cached)
+            body, page_headers = cached
+            return Response(content=body, media_type="application/json", headers={**headers, **page_headers})
+        
+        # Expose the request to FastAPI without adding it to the route's own signature
+        signature = inspect.signature(func)
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+        ])
+        return wrapper
+    return decorator
+
+def invalidates(*collections):
+    """Bump the versions of the collections a mutating route writes to."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                bump_versions(*collections)
+        return wrapper
+    return decorator
+
+# ============= Pagination =============
+# List routes page with an opaque cursor over an indexed sort key instead of a
+# fixed to_list cap. The next cursor and the optional total are returned in the
+# X-Next-Cursor and X-Total-Count headers so the body stays a plain list.
+
+class Page:
+    def __init__(self, items: list, next_cursor: Optional[str] = None, total: Optional[int] = None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.total = total
+    
+    def headers(self) -> dict:
+        headers = {}
+        if self.next_cursor is not None:
+            headers["X-Next-Cursor"] = self.next_cursor
+        if self.total is not None:
+            headers["X-Total-Count"] = str(self.total)
+        return headers
+
+def encode_cursor(doc: dict, sort_keys: tuple) -> str:
+    values = [doc[key] for key in sort_keys]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort_keys: tuple) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != len(sort_keys):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def keyset_filter(sort_keys: tuple, values: list) -> dict:
+    """Match documents strictly after `values` in ascending `sort_keys` order."""
+    clauses = []
+    for i, key in enumerate(sort_keys):
+        clause = dict(zip(sort_keys[:i], values[:i]))
+        clause[key] = {"$gt": values[i]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+def page_query(query: dict, sort_keys: tuple, after: Optional[str]) -> dict:
+    if not after:
+        return query
+    after_filter = keyset_filter(sort_keys, decode_cursor(after, sort_keys))
+    return {"$and": [query, after_filter]} if query else after_filter
+
+async def fetch_page(collection, query: dict, projection: dict, sort_keys: tuple,
+                     limit: int, after: Optional[str], count: bool) -> Page:
+    docs = await collection.find(page_query(query, sort_keys, after), projection).sort(
+        [(key, 1) for key in sort_keys]
+    ).limit(limit + 1).to_list(None)
+    
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1], sort_keys)
+    
+    total = None
+    if count:
+        total = await collection.count_documents(query) if query else await collection.estimated_document_count()
+    return Page(docs, next_cursor, total)
+
+# Large admin lists can be streamed as NDJSON instead: documents are encoded and
+# sent as the cursor yields them, so the full list is never held in memory.
+STREAM_BATCH_SIZE = 200
+
+def stream_documents(collection, query: dict, projection: dict, sort_keys: tuple,
+                     after: Optional[str], model, transform=None) -> StreamingResponse:
+    cursor = collection.find(page_query(query, sort_keys, after), projection).sort(
+        [(key, 1) for key in sort_keys]
+    ).batch_size(STREAM_BATCH_SIZE)
+    
+    async def lines():
+        async for doc in cursor:
+            if transform is not None:
+                doc = transform(doc)
+            yield model.model_validate(doc).model_dump_json().encode() + b"\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+# ============= Team Index =============
+# Fixture lists can embed team names and logos (?expand=teams). They come from
+# an in-memory index of all teams, reloaded whenever the teams version changes,
+# so expanding costs no extra query per request.
+
+class TeamIndex:
+    def __init__(self):
+        self.teams = {}
+        self.versions = None
+        self.lock = asyncio.Lock()
+    
+    async def get(self) -> dict:
+        versions = current_versions(("teams",))
+        if self.versions != versions:
+            async with self.lock:
+                if self.versions != versions:
+                    teams = await db.teams.find({}, {"_id": 0}).to_list(None)
+                    self.teams = {team['id']: team for team in teams}
+                    self.versions = versions
+        return self.teams
+
+team_index = TeamIndex()
+
+def embed_team_names(fixture: dict, teams: dict) -> dict:
+    for side in ("home", "away"):
+        team = teams.get(fixture.get(f"{side}_team_id"))
+        fixture[f"{side}_team_name"] = team['name'] if team else None
+        fixture[f"{side}_team_logo"] = team.get('logo_url') if team else None
+    return fixture
+
+# ============= Sparse Fieldsets =============
+# List routes take `fields=a,b,c` to return only some fields of each item. The
+# list becomes a MongoDB projection and items are serialized with a model
+# trimmed to those fields. `id` is always included.
+
+def parse_fields(fields: Optional[str], model) -> Optional[tuple]:
+    if not fields:
+        return None
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(names - model.model_fields.keys())
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    names.add("id")
+    return tuple(name for name in model.model_fields if name in names)
+
+def sparse_projection(fields: Optional[tuple], *required: str) -> dict:
+    """Projection for the requested fields plus any the route itself needs."""
+    if fields is None:
+        return {"_id": 0}
+    return {"_id": 0, **{name: 1 for name in (*fields, *required)}}
+
+@functools.lru_cache(maxsize=None)
+def sparse_model(model, fields: tuple):
+    return create_model(
+        f"{model.__name__}Fields",
+        __config__=ConfigDict(extra="ignore"),
+        **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields}
+    )
+
+def item_model(model, expanded_model=None, expand: Optional[str] = None, fields: Optional[tuple] = None):
+    """Model for one list item, given the route's `expand` and parsed `fields`."""
+    base = expanded_model if expand and expanded_model else model
+    return sparse_model(base, fields) if fields is not None else base
+
+def list_variant(model, expanded_model=None):
+    """cached_response variant for list routes taking `expand` and `fields`."""
+    def variant(params: dict):
+        base = expanded_model if params.get("expand") and expanded_model else model
+        item = item_model(base, fields=parse_fields(params.get("fields"), base))
+        return List[item]
+    return variant
+
+TEAM_ID_FIELDS = ("home_team_id", "away_team_id")
+
+# ============= Live Feed =============
+# Match changes are fanned out in-process to Server-Sent Events subscribers.
+# Each subscriber has a bounded queue; one that falls behind is dropped instead
+# of buffering without limit, and its EventSource reconnects and refetches.
+
+class LiveSubscriber:
+    def __init__(self, queue_size: int):
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+class LiveHub:
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.subscribers = set()
+        self.sequence = 0
+    
+    def subscribe(self) -> LiveSubscriber:
+        subscriber = LiveSubscriber(self.queue_size)
+        self.subscribers.add(subscriber)
+        return subscriber
+    
+    def unsubscribe(self, subscriber: LiveSubscriber):
+        self.subscribers.discard(subscriber)
+    
+    def publish(self, event: dict):
+        self.sequence += 1
+        # Encode once and hand the same bytes to every subscriber
+        message = f"id: {self.sequence}\ndata: {json.dumps(jsonable_encoder(event))}\n\n".encode()
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                subscriber.dropped = True
+                self.subscribers.discard(subscriber)
+
+live_hub = LiveHub(LIVE_QUEUE_SIZE)
+
+def publish_live(event_type: str, competition: str, fixture_id: str, **data):
+    live_hub.publish({"type": event_type, "competition": competition, "fixture_id": fixture_id, **data})
+
+# ============= Change Feed =============
+# Every write to a watched collection is stamped with this worker's id. The
+# change feed hands each worker the writes made by the others, so their cache
+# versions and live subscribers stay in step with the database.
+
+WORKER_ID = uuid.uuid4().hex
+
+def change_stamp() -> dict:
+    return {"updated_at": datetime.now(timezone.utc), "updated_by": WORKER_ID}
+
+async def mark_deleted(collection: str, document_id):
+    # Deletes leave no stamped document behind for polling workers to find
+    await record_deletion(db, collection, document_id, change_stamp())
+
+LIVE_COMPETITIONS = {"fixtures": "liga", "copa_fixtures": "copa", "copa_brackets": "bracket"}
+
+change_feed = ChangeFeed(db, CHANGE_FEED_NAME, mode=CHANGE_FEED_MODE, poll_seconds=CHANGE_FEED_POLL_SECONDS)
+
+def invalidate_remote_change(change: dict):
+    # Deletes carry no document, so their origin is unknown
+    if change["origin"] != WORKER_ID:
+        bump_versions(change["collection"])
+
+def publish_remote_change(change: dict):
+    competition = LIVE_COMPETITIONS.get(change["collection"])
+    if competition is None or change["document"] is None or change["origin"] == WORKER_ID:
+        return
+    fixture = {k: v for k, v in change["document"].items() if k not in ("updated_at", "updated_by")}
+    publish_live("fixture_changed", competition, change["id"], fixture=fixture)
+
+change_feed.subscribe(invalidate_remote_change)
+change_feed.subscribe(publish_remote_change)
+
+# ============= Match Events =============
+# Goals and cards are appended to the match_events ledger, and player counters
+# move by the entries actually inserted; drift is left to the reconciler.
+
+async def record_match_events(events: List[dict]):
+    await apply_events(db, events, stamp=change_stamp())
+
+async def pull_fixture_item(collection, fixture_id: str, field: str, item_id: str, not_found: str) -> dict:
+    """Atomically remove a goal or card from a fixture array and return it."""
+    fixture = await collection.find_one_and_update(
+        {"id": fixture_id, f"{field}.id": item_id},
+        {"$pull": {field: {"id": item_id}}, "$set": change_stamp()},
+        projection={"_id": 0, field: {"$elemMatch": {"id": item_id}}},
+        return_document=ReturnDocument.BEFORE
+    )
+    if fixture is None:
+        # Only a failed removal pays for telling the two 404s apart
+        if await collection.count_documents({"id": fixture_id}, limit=1) == 0:
+            raise HTTPException(status_code=404, detail="Fixture not found")
+        raise HTTPException(status_code=404, detail=not_found)
+    return fixture[field][0]
+
+class Reconciler:
+    """Runs match event reconciliation in the background, one run at a time."""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.task = None
+        self.schedule_task = None
+    
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+    
+    def start(self) -> bool:
+        if self.running:
+            return False
+        self.task = asyncio.get_running_loop().create_task(self._run())
+        return True
+    
+    async def _run(self):
+        try:
+            report = await reconcile(db, stamp=change_stamp())
+            if report["players_corrected"]:
+                bump_versions("players", "sanctions")
+        except Exception:
+            logger.exception("Reconciliation failed")
+    
+    def start_schedule(self):
+        if self.interval > 0:
+            self.schedule_task = asyncio.get_running_loop().create_task(self._schedule())
+    
+    async def _schedule(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            if self.start():
+                await self.task
+    
+    async def stop(self):
+        for task in (self.schedule_task, self.task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+reconciler = Reconciler(RECONCILE_INTERVAL_SECONDS)
+
+async def void_fixture_events(competition: str, fixture: dict):
+    """Cancel the goals and cards of a deleted fixture."""
+    events = [{**event, "delta": -1} for event in fixture_events(competition, fixture)]
+    if not events:
+        return
+    await record_match_events(events)
+    for event in events:
+        if event["type"] != "goal":
+            sanctions_refresher.schedule(event["player_id"])
+
 # ============= Routes =============
 
 @api_router.get("/")
@@ -365,13 +992,14 @@ async def root():
 
 # Auth Routes
 @api_router.post("/auth/register", response_model=User)
+@fast_response(User)
 async def register(user_data: UserCreate, admin: User = Depends(get_admin_user)):
     # Check if username exists
     existing = await db.users.find_one({"username": user_data.username})
     if existing:
         raise HTTPException(status_code=400, detail="Username already exists")
     
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash(user_data.password)
     user = User(
         username=user_data.username,
         role=user_data.role,
@@ -380,20 +1008,18 @@ async def register(user_data: UserCreate, admin: User = Depends(get_admin_user))
     
     doc = user.model_dump()
     doc['hashed_password'] = hashed_password
-    doc['created_at'] = doc['created_at'].isoformat()
     
     await db.users.insert_one(doc)
+    user_cache.invalidate(user.id)
     return user
 
 @api_router.post("/auth/login", response_model=Token)
+@fast_response(Token)
 async def login(user_data: UserLogin):
     user_doc = await db.users.find_one({"username": user_data.username}, {"_id": 0})
-    if not user_doc or not verify_password(user_data.password, user_doc['hashed_password']):
+    if not user_doc or not await verify_password(user_data.password, user_doc['hashed_password']):
         raise HTTPException(status_code=401, detail="Invalid username or password")
     
-    if isinstance(user_doc['created_at'], str):
-        user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at'])
-    
     user_doc.pop('hashed_password')
     user = User(**user_doc)
     
@@ -401,158 +1027,287 @@ async def login(user_data: UserLogin):
     return Token(access_token=access_token, token_type="bearer", user=user)
 
 @api_router.get("/auth/me", response_model=User)
+@fast_response(User)
 async def get_me(current_user: User = Depends(get_current_user)):
     return current_user
 
 # Team Routes
 @api_router.get("/teams", response_model=List[Team])
+@cached_response(List[Team], "teams")
 async def get_teams():
     teams = await db.teams.find({}, {"_id": 0}).to_list(1000)
-    for team in teams:
-        if isinstance(team['created_at'], str):
-            team['created_at'] = datetime.fromisoformat(team['created_at'])
     return teams
 
 @api_router.get("/teams/{team_id}", response_model=Team)
+@fast_response(Team)
 async def get_team(team_id: str):
     team = await db.teams.find_one({"id": team_id}, {"_id": 0})
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
-    if isinstance(team['created_at'], str):
-        team['created_at'] = datetime.fromisoformat(team['created_at'])
     return Team(**team)
 
+@api_router.get("/teams/{team_id}/dashboard", response_model=TeamDashboard)
+@fast_response(TeamDashboard)
+async def get_team_dashboard(team_id: str):
+    fixture_projection = {"_id": 0, **{field: 1 for field in Fixture.model_fields}}
+    player_projection = {"_id": 0, **{field: 1 for field in Player.model_fields}}
+    teams, fixtures, roster = await asyncio.gather(
+        team_index.get(),
+        db.fixtures.find(
+            {"$or": [{"home_team_id": team_id}, {"away_team_id": team_id}]}, fixture_projection
+        ).to_list(None),
+        db.players.find({"team_id": team_id}, player_projection).sort("name", 1).to_list(None),
+    )
+    team = teams.get(team_id)
+    if not team:
+        raise HTTPException(status_code=404, detail="Team not found")
+    
+    fixtures.sort(key=lambda f: (f['week_number'], f['match_date']))
+    for fixture in fixtures:
+        embed_team_names(fixture, teams)
+    
+    pending = [f for f in fixtures if f.get('status') != "completed"]
+    completed = [f for f in fixtures if f.get('status') == "completed"]
+    
+    return TeamDashboard(
+        team=Team(**team),
+        fixtures=fixtures,
+        roster=roster,
+        next_match=min(pending, key=lambda f: f['match_date'], default=None),
+        last_match=max(completed, key=lambda f: f['match_date'], default=None),
+    )
+
 @api_router.post("/teams", response_model=Team)
+@fast_response(Team)
+@invalidates("teams")
 async def create_team(team_data: TeamCreate, admin: User = Depends(get_admin_user)):
     team = Team(**team_data.model_dump())
     doc = team.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
+    doc.update(change_stamp())
     await db.teams.insert_one(doc)
+    await db.standings.insert_one({**_empty_standings_row(doc), **change_stamp()})
     return team
 
 @api_router.put("/teams/{team_id}", response_model=Team)
+@fast_response(Team)
+@invalidates("teams", "sanctions", "standings")
 async def update_team(team_id: str, team_data: TeamCreate, admin: User = Depends(get_admin_user)):
-    result = await db.teams.update_one(
+    previous = await db.teams.find_one_and_update(
         {"id": team_id},
-        {"$set": team_data.model_dump()}
+        {"$set": {**team_data.model_dump(), **change_stamp()}},
+        projection={"_id": 0, "division": 1},
+        return_document=ReturnDocument.BEFORE
     )
-    if result.matched_count == 0:
+    if previous is None:
         raise HTTPException(status_code=404, detail="Team not found")
     
+    if previous.get("division") != team_data.division:
+        # Results against the old division no longer count, so recompute both tables
+        await rebuild_standings(team_data.division)
+        await rebuild_standings(previous.get("division"))
+    else:
+        await db.standings.update_one({"team_id": team_id}, {"$set": {"team_name": team_data.name, **change_stamp()}})
+    await db.sanctions.update_many(
+        {"team_id": team_id},
+        {"$set": {"team_name": team_data.name, "division": team_data.division, **change_stamp()}}
+    )
+    
     team = await db.teams.find_one({"id": team_id}, {"_id": 0})
-    if isinstance(team['created_at'], str):
-        team['created_at'] = datetime.fromisoformat(team['created_at'])
     return Team(**team)
 
 @api_router.delete("/teams/{team_id}")
+@invalidates("teams", "sanctions", "standings")
 async def delete_team(team_id: str, admin: User = Depends(get_admin_user)):
-    result = await db.teams.delete_one({"id": team_id})
-    if result.deleted_count == 0:
+    team = await db.teams.find_one_and_delete({"id": team_id}, projection={"_id": 0, "division": 1})
+    if team is None:
         raise HTTPException(status_code=404, detail="Team not found")
+    await mark_deleted("teams", team_id)
+    # Opponents lose the results of their games against the deleted team
+    await rebuild_standings(team.get("division"))
+    if (await db.sanctions.delete_many({"team_id": team_id})).deleted_count:
+        await mark_deleted("sanctions", None)
     return {"message": "Team deleted successfully"}
 
 # Player Routes
 @api_router.get("/players", response_model=List[Player])
-async def get_players():
-    players = await db.players.find({}, {"_id": 0}).to_list(1000)
-    for player in players:
-        if isinstance(player['created_at'], str):
-            player['created_at'] = datetime.fromisoformat(player['created_at'])
-    return players
+@cached_response(List[Player], "players", variant=list_variant(Player))
+async def get_players(
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    count: bool = False,
+    stream: bool = False,
+    fields: Optional[str] = None
+):
+    field_names = parse_fields(fields, Player)
+    projection = sparse_projection(field_names, "name")
+    if stream:
+        return stream_documents(db.players, {}, projection, ("name", "id"), after, item_model(Player, fields=field_names))
+    return await fetch_page(db.players, {}, projection, ("name", "id"), limit, after, count)
 
 @api_router.get("/players/team/{team_id}", response_model=List[Player])
-async def get_team_players(team_id: str):
-    players = await db.players.find({"team_id": team_id}, {"_id": 0}).to_list(1000)
-    for player in players:
-        if isinstance(player['created_at'], str):
-            player['created_at'] = datetime.fromisoformat(player['created_at'])
-    return players
+@cached_response(List[Player], "players")
+async def get_team_players(
+    team_id: str,
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    count: bool = False
+):
+    return await fetch_page(db.players, {"team_id": team_id}, {"_id": 0}, ("name", "id"), limit, after, count)
 
 @api_router.post("/players", response_model=Player)
+@fast_response(Player)
+@invalidates("players")
 async def create_player(player_data: PlayerCreate, admin: User = Depends(get_admin_user)):
     player = Player(**player_data.model_dump())
     doc = player.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
+    doc.update(change_stamp())
     await db.players.insert_one(doc)
     return player
 
 @api_router.put("/players/{player_id}", response_model=Player)
+@fast_response(Player)
+@invalidates("players")
 async def update_player(player_id: str, player_data: PlayerCreate, admin: User = Depends(get_admin_user)):
     result = await db.players.update_one(
         {"id": player_id},
-        {"$set": player_data.model_dump()}
+        {"$set": {**player_data.model_dump(), **change_stamp()}}
     )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Player not found")
     
+    sanctions_refresher.schedule(player_id)
+    
     player = await db.players.find_one({"id": player_id}, {"_id": 0})
-    if isinstance(player['created_at'], str):
-        player['created_at'] = datetime.fromisoformat(player['created_at'])
     return Player(**player)
 
 @api_router.delete("/players/{player_id}")
+@invalidates("players", "sanctions")
 async def delete_player(player_id: str, admin: User = Depends(get_admin_user)):
     result = await db.players.delete_one({"id": player_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Player not found")
+    await mark_deleted("players", player_id)
+    if (await db.sanctions.delete_one({"player_id": player_id})).deleted_count:
+        await mark_deleted("sanctions", None)
     return {"message": "Player deleted successfully"}
 
 # Fixture Routes
 @api_router.get("/fixtures", response_model=List[Fixture])
-async def get_fixtures():
-    fixtures = await db.fixtures.find({}, {"_id": 0}).sort("week_number", 1).to_list(1000)
-    for fixture in fixtures:
-        if isinstance(fixture['match_date'], str):
-            fixture['match_date'] = datetime.fromisoformat(fixture['match_date'])
-        if isinstance(fixture['updated_at'], str):
-            fixture['updated_at'] = datetime.fromisoformat(fixture['updated_at'])
-    return fixtures
+@cached_response(List[Fixture], "fixtures", "teams", variant=list_variant(Fixture, FixtureWithTeams))
+async def get_fixtures(
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    count: bool = False,
+    stream: bool = False,
+    expand: Optional[Literal["teams"]] = None,
+    fields: Optional[str] = None
+):
+    field_names = parse_fields(fields, FixtureWithTeams if expand else Fixture)
+    projection = sparse_projection(field_names, "week_number", *(TEAM_ID_FIELDS if expand else ()))
+    teams = await team_index.get() if expand else None
+    if stream:
+        model = item_model(Fixture, FixtureWithTeams, expand, field_names)
+        if teams is None:
+            return stream_documents(db.fixtures, {}, projection, ("week_number", "id"), after, model)
+        return stream_documents(db.fixtures, {}, projection, ("week_number", "id"), after, model,
+                                transform=lambda doc: embed_team_names(doc, teams))
+    page = await fetch_page(db.fixtures, {}, projection, ("week_number", "id"), limit, after, count)
+    if teams is not None:
+        for fixture in page.items:
+            embed_team_names(fixture, teams)
+    return page
 
 @api_router.get("/fixtures/division/{division}", response_model=List[Fixture])
-async def get_division_fixtures(division: int):
-    fixtures = await db.fixtures.find({"division": division}, {"_id": 0}).sort("week_number", 1).to_list(1000)
-    for fixture in fixtures:
-        if isinstance(fixture['match_date'], str):
-            fixture['match_date'] = datetime.fromisoformat(fixture['match_date'])
-        if isinstance(fixture['updated_at'], str):
-            fixture['updated_at'] = datetime.fromisoformat(fixture['updated_at'])
+@cached_response(List[Fixture], "fixtures", "teams", variant=list_variant(Fixture, FixtureWithTeams))
+async def get_division_fixtures(division: int, expand: Optional[Literal["teams"]] = None, fields: Optional[str] = None):
+    field_names = parse_fields(fields, FixtureWithTeams if expand else Fixture)
+    projection = sparse_projection(field_names, *(TEAM_ID_FIELDS if expand else ()))
+    fixtures = await db.fixtures.find({"division": division}, projection).sort("week_number", 1).to_list(1000)
+    if expand:
+        teams = await team_index.get()
+        for fixture in fixtures:
+            embed_team_names(fixture, teams)
     return fixtures
 
+async def load_match_detail(collection, fixture_id: str, not_found: str = "Fixture not found") -> dict:
+    """A fixture with both teams and both rosters, for the fixture editors."""
+    fixture = await collection.find_one({"id": fixture_id}, {"_id": 0})
+    if not fixture:
+        raise HTTPException(status_code=404, detail=not_found)
+    
+    home_id, away_id = fixture.get('home_team_id'), fixture.get('away_team_id')
+    team_ids = [team_id for team_id in (home_id, away_id) if team_id]
+    teams, players = await asyncio.gather(
+        db.teams.find({"id": {"$in": team_ids}}, {"_id": 0}).to_list(None),
+        db.players.find({"team_id": {"$in": team_ids}}, {"_id": 0}).sort("name", 1).to_list(None),
+    )
+    teams_by_id = {team['id']: team for team in teams}
+    
+    return {
+        "fixture": fixture,
+        "home_team": teams_by_id.get(home_id),
+        "away_team": teams_by_id.get(away_id),
+        "home_roster": [player for player in players if player['team_id'] == home_id],
+        "away_roster": [player for player in players if player['team_id'] == away_id],
+    }
+
+@api_router.get("/fixtures/{fixture_id}", response_model=FixtureDetail)
+@fast_response(FixtureDetail)
+async def get_fixture(fixture_id: str):
+    return await load_match_detail(db.fixtures, fixture_id)
+
 @api_router.post("/fixtures", response_model=Fixture)
+@fast_response(Fixture)
+@invalidates("fixtures")
 async def create_fixture(fixture_data: FixtureCreate, admin: User = Depends(get_admin_user)):
-    fixture_dict = fixture_data.model_dump()
-    fixture_dict['match_date'] = datetime.fromisoformat(fixture_data.match_date)
-    fixture = Fixture(**fixture_dict)
+    # Standings only count matches between two teams of the fixture's division
+    if fixture_data.home_team_id == fixture_data.away_team_id:
+        raise HTTPException(status_code=400, detail=f"Team {fixture_data.home_team_id} cannot play itself")
+    team_ids = [fixture_data.home_team_id, fixture_data.away_team_id]
+    teams = await db.teams.find({"id": {"$in": team_ids}}, {"_id": 0, "id": 1, "division": 1}).to_list(None)
+    team_divisions = {team["id"]: team["division"] for team in teams}
+    missing = [team_id for team_id in team_ids if team_id not in team_divisions]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Unknown team ids: {', '.join(missing)}")
+    for team_id in team_ids:
+        if team_divisions[team_id] != fixture_data.division:
+            raise HTTPException(status_code=400, detail=f"Team {team_id} is not in division {fixture_data.division}")
+    
+    fixture = Fixture(**fixture_data.model_dump())
     
     doc = fixture.model_dump()
-    doc['match_date'] = doc['match_date'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
     
+    doc.update(change_stamp())
     await db.fixtures.insert_one(doc)
     return fixture
 
 @api_router.put("/fixtures/{fixture_id}", response_model=Fixture)
+@fast_response(Fixture)
+@invalidates("fixtures")
 async def update_fixture(fixture_id: str, fixture_data: FixtureUpdate, current_user: User = Depends(get_current_user)):
     update_data = {k: v for k, v in fixture_data.model_dump().items() if v is not None}
-    update_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+    stamp = change_stamp()
     
-    result = await db.fixtures.update_one(
+    # Read the previous state atomically so the standings delta is exact
+    old_fixture = await db.fixtures.find_one_and_update(
         {"id": fixture_id},
-        {"$set": update_data}
+        {"$set": {**update_data, **stamp}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.BEFORE
     )
     
-    if result.matched_count == 0:
+    if old_fixture is None:
         raise HTTPException(status_code=404, detail="Fixture not found")
     
-    fixture = await db.fixtures.find_one({"id": fixture_id}, {"_id": 0})
-    if isinstance(fixture['match_date'], str):
-        fixture['match_date'] = datetime.fromisoformat(fixture['match_date'])
-    if isinstance(fixture['updated_at'], str):
-        fixture['updated_at'] = datetime.fromisoformat(fixture['updated_at'])
+    fixture = {**old_fixture, **update_data, **stamp}
+    await apply_standings_delta(old_fixture, fixture)
+    
+    publish_live("fixture_updated", "liga", fixture_id, changes=update_data)
     
     return Fixture(**fixture)
 
 @api_router.post("/fixtures/{fixture_id}/goals")
+@invalidates("fixtures", "players")
 async def add_goal_scorer(fixture_id: str, goal_data: AddGoalScorer, current_user: User = Depends(get_current_user)):
     # Get player info
     player = await db.players.find_one({"id": goal_data.player_id}, {"_id": 0})
@@ -567,54 +1322,98 @@ async def add_goal_scorer(fixture_id: str, goal_data: AddGoalScorer, current_use
     
     field = "home_scorers" if goal_data.team_side == "home" else "away_scorers"
     
-    await db.fixtures.update_one(
+    result = await db.fixtures.update_one(
         {"id": fixture_id},
-        {"$push": {field: goal_scorer.model_dump()}}
+        {"$push": {field: goal_scorer.model_dump()}, "$set": change_stamp()}
     )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Fixture not found")
     
-    # Update player goals count
-    await db.players.update_one(
-        {"id": goal_data.player_id},
-        {"$inc": {"goals_scored": 1}}
-    )
+    await record_match_events([match_event("liga", fixture_id, field.split("_")[0], goal_scorer.model_dump())])
+    
+    publish_live("goal_added", "liga", fixture_id, team_side="home" if goal_data.team_side == "home" else "away", goal=goal_scorer.model_dump())
     
     return {"message": "Goal scorer added successfully"}
 
-@api_router.delete("/fixtures/{fixture_id}/goals")
-async def remove_goal_scorer(fixture_id: str, goal_data: RemoveGoalScorer, admin: User = Depends(get_admin_user)):
-    # Get fixture to find the goal scorer
-    fixture = await db.fixtures.find_one({"id": fixture_id}, {"_id": 0})
-    if not fixture:
-        raise HTTPException(status_code=404, detail="Fixture not found")
+@api_router.post("/fixtures/{fixture_id}/match-sheet", response_model=Fixture)
+@fast_response(Fixture)
+@invalidates("fixtures", "players")
+async def submit_match_sheet(fixture_id: str, sheet: MatchSheet, current_user: User = Depends(get_current_user)):
+    player_ids = {event.player_id for event in sheet.scorers} | {event.player_id for event in sheet.cards}
+    players = await db.players.find({"id": {"$in": list(player_ids)}}, {"_id": 0, "id": 1, "name": 1}).to_list(None)
+    player_names = {player["id"]: player["name"] for player in players}
+    
+    missing = sorted(player_ids - player_names.keys())
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Players not found: {', '.join(missing)}")
+    
+    update_data = {k: v for k, v in sheet.model_dump(include={"home_score", "away_score", "status"}).items() if v is not None}
+    pushes = {"home_scorers": [], "away_scorers": [], "home_cards": [], "away_cards": []}
+    
+    for event in sheet.scorers:
+        side = "home" if event.team_side == "home" else "away"
+        goal = GoalScorer(player_id=event.player_id, player_name=player_names[event.player_id], minute=event.minute)
+        pushes[f"{side}_scorers"].append(goal.model_dump())
+    
+    for event in sheet.cards:
+        side = "home" if event.team_side == "home" else "away"
+        card = Card(player_id=event.player_id, player_name=player_names[event.player_id],
+                    card_type=event.card_type, minute=event.minute)
+        pushes[f"{side}_cards"].append(card.model_dump())
+    
+    update = {"$set": {**update_data, **change_stamp()}}
+    push = {field: {"$each": items} for field, items in pushes.items() if items}
+    if push:
+        update["$push"] = push
+    
+    old_fixture = await db.fixtures.find_one_and_update(
+        {"id": fixture_id},
+        update,
+        projection={"_id": 0},
+        return_document=ReturnDocument.BEFORE
+    )
     
-    field = "home_scorers" if goal_data.team_side == "home" else "away_scorers"
-    scorers = fixture.get(field, [])
+    if old_fixture is None:
+        raise HTTPException(status_code=404, detail="Fixture not found")
     
-    # Find the goal scorer and player_id
-    player_id = None
-    for scorer in scorers:
-        if scorer['id'] == goal_data.goal_id:
-            player_id = scorer['player_id']
-            break
+    fixture = {**old_fixture, **update_data}
+    for field, items in pushes.items():
+        fixture[field] = old_fixture.get(field, []) + items
+    await apply_standings_delta(old_fixture, fixture)
+    
+    events = [match_event("liga", fixture_id, field.split("_")[0], item) for field, items in pushes.items() for item in items]
+    if events:
+        await record_match_events(events)
+    
+    for event in sheet.cards:
+        sanctions_refresher.schedule(event.player_id)
+    
+    if update_data:
+        publish_live("fixture_updated", "liga", fixture_id, changes=update_data)
+    for field, items in pushes.items():
+        side, kind = field.split("_")
+        for item in items:
+            if kind == "scorers":
+                publish_live("goal_added", "liga", fixture_id, team_side=side, goal=item)
+            else:
+                publish_live("card_added", "liga", fixture_id, team_side=side, card=item)
     
-    if not player_id:
-        raise HTTPException(status_code=404, detail="Goal scorer not found")
+    return Fixture(**fixture)
+
+@api_router.delete("/fixtures/{fixture_id}/goals")
+@invalidates("fixtures", "players")
+async def remove_goal_scorer(fixture_id: str, goal_data: RemoveGoalScorer, admin: User = Depends(get_admin_user)):
+    field = "home_scorers" if goal_data.team_side == "home" else "away_scorers"
+    scorer = await pull_fixture_item(db.fixtures, fixture_id, field, goal_data.goal_id, "Goal scorer not found")
     
-    # Remove goal scorer from fixture
-    await db.fixtures.update_one(
-        {"id": fixture_id},
-        {"$pull": {field: {"id": goal_data.goal_id}}}
-    )
+    await record_match_events([match_event("liga", fixture_id, field.split("_")[0], scorer, delta=-1)])
     
-    # Decrement player goals count
-    await db.players.update_one(
-        {"id": player_id},
-        {"$inc": {"goals_scored": -1}}
-    )
+    publish_live("goal_removed", "liga", fixture_id, team_side="home" if goal_data.team_side == "home" else "away", goal_id=goal_data.goal_id)
     
     return {"message": "Goal scorer removed successfully"}
 
 @api_router.post("/fixtures/{fixture_id}/cards")
+@invalidates("fixtures", "players")
 async def add_card(fixture_id: str, card_data: AddCard, current_user: User = Depends(get_current_user)):
     # Get player info
     player = await db.players.find_one({"id": card_data.player_id}, {"_id": 0})
@@ -630,179 +1429,243 @@ async def add_card(fixture_id: str, card_data: AddCard, current_user: User = Dep
     
     field = "home_cards" if card_data.team_side == "home" else "away_cards"
     
-    await db.fixtures.update_one(
+    result = await db.fixtures.update_one(
         {"id": fixture_id},
-        {"$push": {field: card.model_dump()}}
+        {"$push": {field: card.model_dump()}, "$set": change_stamp()}
     )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Fixture not found")
     
-    # Update player card count
-    card_field = "yellow_cards" if card_data.card_type == "yellow" else "red_cards"
-    await db.players.update_one(
-        {"id": card_data.player_id},
-        {"$inc": {card_field: 1}}
-    )
+    await record_match_events([match_event("liga", fixture_id, field.split("_")[0], card.model_dump())])
+    
+    sanctions_refresher.schedule(card_data.player_id)
+    
+    publish_live("card_added", "liga", fixture_id, team_side="home" if card_data.team_side == "home" else "away", card=card.model_dump())
     
     return {"message": "Card added successfully"}
 
 @api_router.delete("/fixtures/{fixture_id}/cards")
+@invalidates("fixtures", "players")
 async def remove_card(fixture_id: str, card_data: RemoveCard, admin: User = Depends(get_admin_user)):
-    # Get fixture to find the card
-    fixture = await db.fixtures.find_one({"id": fixture_id}, {"_id": 0})
-    if not fixture:
-        raise HTTPException(status_code=404, detail="Fixture not found")
-    
     field = "home_cards" if card_data.team_side == "home" else "away_cards"
-    cards = fixture.get(field, [])
-    
-    # Find the card and player_id
-    player_id = None
-    card_type = None
-    for card in cards:
-        if card['id'] == card_data.card_id:
-            player_id = card['player_id']
-            card_type = card['card_type']
-            break
-    
-    if not player_id:
-        raise HTTPException(status_code=404, detail="Card not found")
-    
-    # Remove card from fixture
-    await db.fixtures.update_one(
-        {"id": fixture_id},
-        {"$pull": {field: {"id": card_data.card_id}}}
-    )
+    card = await pull_fixture_item(db.fixtures, fixture_id, field, card_data.card_id, "Card not found")
     
-    # Decrement player card count
-    card_field = "yellow_cards" if card_type == "yellow" else "red_cards"
-    await db.players.update_one(
-        {"id": player_id},
-        {"$inc": {card_field: -1}}
-    )
+    await record_match_events([match_event("liga", fixture_id, field.split("_")[0], card, delta=-1)])
+    
+    sanctions_refresher.schedule(card['player_id'])
+    
+    publish_live("card_removed", "liga", fixture_id, team_side="home" if card_data.team_side == "home" else "away", card_id=card_data.card_id)
     
     return {"message": "Card removed successfully"}
 
 @api_router.delete("/fixtures/{fixture_id}")
+@invalidates("fixtures", "players")
 async def delete_fixture(fixture_id: str, admin: User = Depends(get_admin_user)):
-    result = await db.fixtures.delete_one({"id": fixture_id})
-    if result.deleted_count == 0:
+    fixture = await db.fixtures.find_one_and_delete({"id": fixture_id}, projection={"_id": 0})
+    if fixture is None:
         raise HTTPException(status_code=404, detail="Fixture not found")
+    await mark_deleted("fixtures", fixture_id)
+    await apply_standings_delta(fixture, None)
+    await void_fixture_events("liga", fixture)
     return {"message": "Fixture deleted successfully"}
 
 @api_router.post("/fixtures/bulk")
+@invalidates("fixtures")
 async def create_fixtures_bulk(data: FixtureCreateBulk, admin: User = Depends(get_admin_user)):
-    created_fixtures = []
-    for fixture_data in data.fixtures:
-        fixture_dict = {
-            "division": data.division,
-            "week_number": data.week_number,
-            "home_team_id": fixture_data["home_team_id"],
-            "away_team_id": fixture_data["away_team_id"],
-            "match_date": datetime.fromisoformat(fixture_data["match_date"])
+    weeks = list(data.weeks)
+    if data.fixtures:
+        if data.division is None or data.week_number is None:
+            raise HTTPException(status_code=400, detail="division and week_number are required with fixtures")
+        weeks.insert(0, FixtureWeek(division=data.division, week_number=data.week_number, fixtures=data.fixtures))
+    
+    # Validate every team in one query before writing anything
+    team_ids = {team_id for week in weeks for item in week.fixtures for team_id in (item.home_team_id, item.away_team_id)}
+    teams = await db.teams.find({"id": {"$in": list(team_ids)}}, {"_id": 0, "id": 1, "division": 1}).to_list(None)
+    team_divisions = {team["id"]: team["division"] for team in teams}
+    
+    missing = sorted(team_ids - team_divisions.keys())
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Unknown team ids: {', '.join(missing)}")
+    
+    docs = []
+    for week in weeks:
+        for item in week.fixtures:
+            if item.home_team_id == item.away_team_id:
+                raise HTTPException(status_code=400, detail=f"Team {item.home_team_id} cannot play itself (week {week.week_number})")
+            for team_id in (item.home_team_id, item.away_team_id):
+                if team_divisions[team_id] != week.division:
+                    raise HTTPException(status_code=400, detail=f"Team {team_id} is not in division {week.division}")
+            fixture = Fixture(division=week.division, week_number=week.week_number, **item.model_dump())
+            doc = fixture.model_dump()
+            doc.update(change_stamp())
+            docs.append(doc)
+    
+    if docs:
+        await db.fixtures.insert_many(docs, ordered=True)
+    
+    return {"message": f"Created {len(docs)} fixtures successfully", "ids": [doc["id"] for doc in docs]}
+
+# Live Feed Route
+@api_router.get("/live/fixtures")
+async def live_fixtures():
+    subscriber = live_hub.subscribe()
+    
+    async def events():
+        try:
+            yield b"retry: 3000\n\n"
+            while not (subscriber.dropped and subscriber.queue.empty()):
+                try:
+                    yield await asyncio.wait_for(subscriber.queue.get(), LIVE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            live_hub.unsubscribe(subscriber)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Standings
+# The `standings` collection holds one row per team and is kept up to date by
+# applying the difference between a fixture's old and new result on every
+# fixture write, so reading a table is a single indexed query.
+STANDINGS_COUNTERS = (
+    'games_played', 'games_won', 'games_draw', 'games_lost',
+    'goals_for', 'goals_against', 'goal_difference', 'points'
+)
+
+def _empty_standings_row(team: dict) -> dict:
+    row = {'team_id': team['id'], 'team_name': team['name'], 'division': team['division']}
+    row.update({counter: 0 for counter in STANDINGS_COUNTERS})
+    return row
+
+def _standings_contribution(fixture: Optional[dict]) -> dict:
+    """Counters a fixture adds to each team's row, keyed by team id."""
+    if not fixture or fixture.get('status') != "completed":
+        return {}
+    
+    home_score = fixture.get('home_score') or 0
+    away_score = fixture.get('away_score') or 0
+    
+    contribution = {}
+    for team_id, scored, conceded in (
+        (fixture['home_team_id'], home_score, away_score),
+        (fixture['away_team_id'], away_score, home_score),
+    ):
+        contribution[team_id] = {
+            'games_played': 1,
+            'games_won': 1 if scored > conceded else 0,
+            'games_draw': 1 if scored == conceded else 0,
+            'games_lost': 1 if scored < conceded else 0,
+            'goals_for': scored,
+            'goals_against': conceded,
+            'goal_difference': scored - conceded,
+            'points': 3 if scored > conceded else 1 if scored == conceded else 0,
         }
-        fixture = Fixture(**fixture_dict)
-        
-        doc = fixture.model_dump()
-        doc['match_date'] = doc['match_date'].isoformat()
-        doc['updated_at'] = doc['updated_at'].isoformat()
-        
-        await db.fixtures.insert_one(doc)
-        created_fixtures.append(fixture)
-    
-    return {"message": f"Created {len(created_fixtures)} fixtures successfully"}
+    return contribution
+
+async def apply_standings_delta(old_fixture: Optional[dict], new_fixture: Optional[dict]):
+    """Move the standings from a fixture's old state to its new state."""
+    old = _standings_contribution(old_fixture)
+    new = _standings_contribution(new_fixture)
+    
+    operations = []
+    for team_id in set(old) | set(new):
+        before = old.get(team_id, {})
+        after = new.get(team_id, {})
+        inc = {}
+        for counter in STANDINGS_COUNTERS:
+            diff = after.get(counter, 0) - before.get(counter, 0)
+            if diff:
+                inc[counter] = diff
+        if inc:
+            operations.append(UpdateOne({"team_id": team_id}, {"$inc": inc, "$set": change_stamp()}))
+    
+    if operations:
+        await db.standings.bulk_write(operations, ordered=False)
+
+async def rebuild_standings(division: Optional[int] = None) -> int:
+    """Recompute standings rows from teams and completed fixtures."""
+    query = {} if division is None else {"division": division}
+    teams = await db.teams.find(query, {"_id": 0}).to_list(None)
+    fixtures = await db.fixtures.find({**query, "status": "completed"}, {"_id": 0}).to_list(None)
+    
+    rows = {team['id']: _empty_standings_row(team) for team in teams}
+    for fixture in fixtures:
+        contribution = _standings_contribution(fixture)
+        # Only count matches between two teams of the fixture's division
+        if not all(team_id in rows and rows[team_id]['division'] == fixture['division']
+                   for team_id in contribution):
+            continue
+        for team_id, counters in contribution.items():
+            for counter, value in counters.items():
+                rows[team_id][counter] += value
+    
+    # Replace rows in place so the table is never empty and concurrent rebuilds
+    # don't collide on the unique team_id index, then drop rows of removed teams
+    stamp = change_stamp()
+    if rows:
+        await db.standings.bulk_write([
+            ReplaceOne({"team_id": team_id}, {**row, **stamp}, upsert=True)
+            for team_id, row in rows.items()
+        ], ordered=False)
+    if (await db.standings.delete_many({**query, "team_id": {"$nin": list(rows)}})).deleted_count:
+        await mark_deleted("standings", None)
+    return len(rows)
 
-# Standings Route
 @api_router.get("/standings/division/{division}", response_model=List[StandingsRow])
+@cached_response(List[StandingsRow], "teams", "fixtures", "standings")
 async def get_standings(division: int):
-    teams = await db.teams.find({"division": division}, {"_id": 0}).to_list(1000)
-    fixtures = await db.fixtures.find({"division": division, "status": "completed"}, {"_id": 0}).to_list(1000)
-    
-    standings = {}
-    for team in teams:
-        standings[team['id']] = {
-            'team_id': team['id'],
-            'team_name': team['name'],
-            'games_played': 0,
-            'games_won': 0,
-            'games_draw': 0,
-            'games_lost': 0,
-            'goals_for': 0,
-            'goals_against': 0,
-            'points': 0
-        }
-    
-    for fixture in fixtures:
-        home_id = fixture['home_team_id']
-        away_id = fixture['away_team_id']
-        home_score = fixture['home_score'] or 0
-        away_score = fixture['away_score'] or 0
-        
-        if home_id in standings and away_id in standings:
-            standings[home_id]['games_played'] += 1
-            standings[away_id]['games_played'] += 1
-            standings[home_id]['goals_for'] += home_score
-            standings[home_id]['goals_against'] += away_score
-            standings[away_id]['goals_for'] += away_score
-            standings[away_id]['goals_against'] += home_score
-            
-            if home_score > away_score:
-                standings[home_id]['games_won'] += 1
-                standings[home_id]['points'] += 3
-                standings[away_id]['games_lost'] += 1
-            elif home_score < away_score:
-                standings[away_id]['games_won'] += 1
-                standings[away_id]['points'] += 3
-                standings[home_id]['games_lost'] += 1
-            else:
-                standings[home_id]['games_draw'] += 1
-                standings[away_id]['games_draw'] += 1
-                standings[home_id]['points'] += 1
-                standings[away_id]['points'] += 1
+    rows = await db.standings.find({"division": division}, {"_id": 0}).sort(
+        [("points", -1), ("goal_difference", -1), ("team_name", 1)]
+    ).to_list(None)
     
-    standings_list = list(standings.values())
-    standings_list.sort(key=lambda x: (x['points'], x['goals_for'] - x['goals_against']), reverse=True)
-    
-    result = []
-    for i, row in enumerate(standings_list):
-        result.append(StandingsRow(
-            position=i + 1,
-            team_id=row['team_id'],
-            team_name=row['team_name'],
-            games_played=row['games_played'],
-            games_won=row['games_won'],
-            games_draw=row['games_draw'],
-            games_lost=row['games_lost'],
-            goals_for=row['goals_for'],
-            goals_against=row['goals_against'],
-            goal_difference=row['goals_for'] - row['goals_against'],
-            points=row['points']
-        ))
-    
-    return result
+    return [StandingsRow(position=i + 1, **row) for i, row in enumerate(rows)]
+
+@api_router.post("/standings/rebuild")
+@invalidates("standings")
+async def rebuild_standings_route(division: Optional[int] = None, admin: User = Depends(get_admin_user)):
+    count = await rebuild_standings(division)
+    return {"message": f"Rebuilt standings for {count} teams"}
 
 # Top Scorers Route
 @api_router.get("/top-scorers", response_model=List[TopScorer])
-async def get_top_scorers(division: Optional[int] = None):
-    if division:
-        teams = await db.teams.find({"division": division}, {"_id": 0}).to_list(1000)
-        team_ids = [team['id'] for team in teams]
-        players = await db.players.find({"team_id": {"$in": team_ids}}, {"_id": 0}).sort("goals_scored", -1).to_list(100)
+@cached_response(List[TopScorer], "players", "teams")
+async def get_top_scorers(
+    division: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0)
+):
+    join_team = [
+        {"$lookup": {"from": "teams", "localField": "team_id", "foreignField": "id", "as": "team"}},
+        {"$unwind": {"path": "$team", "preserveNullAndEmptyArrays": True}},
+    ]
+    page = [
+        # Ties are broken by name, then id, so pages are stable
+        {"$sort": {"goals_scored": -1, "name": 1, "id": 1}},
+        {"$skip": offset},
+        {"$limit": limit},
+    ]
+    pipeline = [{"$match": {"goals_scored": {"$gt": 0}}}]
+    if division is None:
+        # Page on the (goals_scored, name, id) index and join only the returned players
+        pipeline += page + join_team
     else:
-        players = await db.players.find({}, {"_id": 0}).sort("goals_scored", -1).to_list(100)
-    
-    result = []
-    for player in players:
-        if player['goals_scored'] > 0:
-            team = await db.teams.find_one({"id": player['team_id']}, {"_id": 0})
-            result.append(TopScorer(
-                player_id=player['id'],
-                player_name=player['name'],
-                team_id=player['team_id'],
-                team_name=team['name'] if team else "Unknown",
-                division=team['division'] if team else 1,
-                goals=player['goals_scored']
-            ))
-    
-    return result
+        pipeline += join_team + [{"$match": {"team.division": division}}] + page
+    pipeline += [
+        {"$project": {
+            "_id": 0,
+            "player_id": "$id",
+            "player_name": "$name",
+            "team_id": "$team_id",
+            "team_name": {"$ifNull": ["$team.name", "Unknown"]},
+            "division": {"$ifNull": ["$team.division", 1]},
+            "goals": "$goals_scored",
+        }},
+    ]
+    return await db.players.aggregate(pipeline).to_list(None)
 
 # Cards Statistics
 class PlayerCards(BaseModel):
@@ -813,38 +1676,75 @@ class PlayerCards(BaseModel):
     yellow_cards: int
     red_cards: int
 
+# Stages turning match documents into one document per card
+MATCH_CARDS_STAGES = [
+    {"$project": {"_id": 0, "card": {"$concatArrays": [
+        {"$ifNull": ["$home_cards", []]},
+        {"$ifNull": ["$away_cards", []]},
+    ]}}},
+    {"$unwind": "$card"},
+]
+
 @api_router.get("/cards-statistics", response_model=List[PlayerCards])
-async def get_cards_statistics(division: Optional[int] = None):
-    if division:
-        teams = await db.teams.find({"division": division}, {"_id": 0}).to_list(1000)
-        team_ids = [team['id'] for team in teams]
-        players = await db.players.find({
-            "team_id": {"$in": team_ids},
-            "$or": [{"yellow_cards": {"$gt": 0}}, {"red_cards": {"$gt": 0}}]
-        }, {"_id": 0}).to_list(100)
+@cached_response(List[PlayerCards], "players", "teams", "fixtures", "copa_fixtures", "copa_brackets")
+async def get_cards_statistics(
+    division: Optional[int] = None,
+    competition: Optional[str] = Query(None, pattern="^(liga|copa)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0)
+):
+    if competition is None:
+        # Season totals come straight from the player counters
+        collection = db.players
+        pipeline = [
+            {"$match": {"$or": [{"yellow_cards": {"$gt": 0}}, {"red_cards": {"$gt": 0}}]}},
+            {"$project": {"_id": 0, "player_id": "$id", "player_name": "$name", "team_id": 1,
+                          "yellow_cards": {"$ifNull": ["$yellow_cards", 0]},
+                          "red_cards": {"$ifNull": ["$red_cards", 0]}}},
+        ]
     else:
-        players = await db.players.find({
-            "$or": [{"yellow_cards": {"$gt": 0}}, {"red_cards": {"$gt": 0}}]
-        }, {"_id": 0}).to_list(100)
-    
-    result = []
-    for player in players:
-        team = await db.teams.find_one({"id": player['team_id']}, {"_id": 0})
-        result.append(PlayerCards(
-            player_id=player['id'],
-            player_name=player['name'],
-            team_id=player['team_id'],
-            team_name=team['name'] if team else "Unknown",
-            yellow_cards=player.get('yellow_cards', 0),
-            red_cards=player.get('red_cards', 0)
-        ))
-    
-    # Sort by red cards first, then yellow cards
-    result.sort(key=lambda x: (x.red_cards, x.yellow_cards), reverse=True)
-    return result
+        # Per-competition totals are counted from the cards recorded on the matches
+        if competition == "liga":
+            collection = db.fixtures
+            pipeline = list(MATCH_CARDS_STAGES)
+        else:
+            collection = db.copa_fixtures
+            pipeline = MATCH_CARDS_STAGES + [{"$unionWith": {"coll": "copa_brackets", "pipeline": MATCH_CARDS_STAGES}}]
+        pipeline += [
+            {"$group": {
+                "_id": "$card.player_id",
+                "player_name": {"$last": "$card.player_name"},
+                "yellow_cards": {"$sum": {"$cond": [{"$eq": ["$card.card_type", "yellow"]}, 1, 0]}},
+                "red_cards": {"$sum": {"$cond": [{"$eq": ["$card.card_type", "yellow"]}, 0, 1]}},
+            }},
+            {"$lookup": {"from": "players", "localField": "_id", "foreignField": "id", "as": "player"}},
+            {"$unwind": {"path": "$player", "preserveNullAndEmptyArrays": True}},
+            {"$project": {"_id": 0, "player_id": "$_id",
+                          "player_name": {"$ifNull": ["$player.name", "$player_name"]},
+                          "team_id": {"$ifNull": ["$player.team_id", ""]},
+                          "yellow_cards": 1, "red_cards": 1}},
+        ]
+    
+    pipeline += [
+        {"$lookup": {"from": "teams", "localField": "team_id", "foreignField": "id", "as": "team"}},
+        {"$unwind": {"path": "$team", "preserveNullAndEmptyArrays": True}},
+    ]
+    if division is not None:
+        pipeline.append({"$match": {"team.division": division}})
+    pipeline += [
+        # Red cards first, then yellow cards; name and id keep pages stable
+        {"$sort": {"red_cards": -1, "yellow_cards": -1, "player_name": 1, "player_id": 1}},
+        {"$skip": offset},
+        {"$limit": limit},
+        {"$project": {"player_id": 1, "player_name": 1, "team_id": 1,
+                      "team_name": {"$ifNull": ["$team.name", "Unknown"]},
+                      "yellow_cards": 1, "red_cards": 1}},
+    ]
+    return await collection.aggregate(pipeline).to_list(None)
 
 # Subscription Routes
 @api_router.post("/subscriptions/create", response_model=Subscription)
+@fast_response(Subscription)
 async def create_subscription(sub_data: SubscriptionCreate):
     # Check if subscription already exists
     existing = await db.subscriptions.find_one({"email": sub_data.email, "season": sub_data.season})
@@ -860,8 +1760,6 @@ async def create_subscription(sub_data: SubscriptionCreate):
     )
     
     doc = subscription.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['expires_at'] = doc['expires_at'].isoformat()
     
     await db.subscriptions.insert_one(doc)
     return subscription
@@ -869,29 +1767,45 @@ async def create_subscription(sub_data: SubscriptionCreate):
 @api_router.get("/subscriptions/verify/{email}")
 async def verify_subscription(email: str, season: str):
     subscription = await db.subscriptions.find_one(
-        {"email": email, "season": season, "payment_status": "completed"},
-        {"_id": 0}
+        {
+            "email": email,
+            "season": season,
+            "payment_status": "completed",
+            "expires_at": {"$gt": datetime.now(timezone.utc)}
+        },
+        {"_id": 1}
     )
-    
-    if not subscription:
-        return {"valid": False}
-    
-    if isinstance(subscription['expires_at'], str):
-        expires_at = datetime.fromisoformat(subscription['expires_at'])
-    else:
-        expires_at = subscription['expires_at']
-    
-    is_valid = expires_at > datetime.now(timezone.utc)
-    return {"valid": is_valid}
+    return {"valid": subscription is not None}
 
 # User Management (Admin only)
 @api_router.get("/users", response_model=List[User])
-async def get_users(admin: User = Depends(get_admin_user)):
-    users = await db.users.find({}, {"_id": 0, "hashed_password": 0}).to_list(1000)
-    for user in users:
-        if isinstance(user['created_at'], str):
-            user['created_at'] = datetime.fromisoformat(user['created_at'])
-    return users
+@fast_response(List[User])
+async def get_users(
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    count: bool = False,
+    admin: User = Depends(get_admin_user)
+):
+    return await fetch_page(db.users, {}, {"_id": 0, "hashed_password": 0}, ("username", "id"), limit, after, count)
+
+@api_router.get("/admin/metrics")
+async def get_metrics(admin: User = Depends(get_admin_user)):
+    return {"password_hashing": password_hash_metrics.snapshot()}
+
+@api_router.get("/admin/index-usage")
+async def get_index_usage(admin: User = Depends(get_admin_user)):
+    return await index_usage(db)
+
+@api_router.post("/admin/reconcile", status_code=status.HTTP_202_ACCEPTED)
+async def start_reconcile(admin: User = Depends(get_admin_user)):
+    if not reconciler.start():
+        raise HTTPException(status_code=409, detail="Reconciliation already running")
+    return {"message": "Reconciliation started"}
+
+@api_router.get("/admin/reconcile")
+async def get_reconcile_status(admin: User = Depends(get_admin_user)):
+    state = await db["_reconcile"].find_one({"_id": "players"}, {"_id": 0})
+    return {**(state or {}), "running": reconciler.running}
 
 # Initialize admin user
 @api_router.post("/init-admin")
@@ -900,52 +1814,54 @@ async def init_admin():
     if existing:
         return {"message": "Admin already exists"}
     
-    hashed_password = get_password_hash("admin123")
+    hashed_password = await get_password_hash("admin123")
     admin_user = User(username="admin", role="admin")
     
     doc = admin_user.model_dump()
     doc['hashed_password'] = hashed_password
-    doc['created_at'] = doc['created_at'].isoformat()
     
     await db.users.insert_one(doc)
+    user_cache.invalidate(admin_user.id)
     return {"message": "Admin user created", "username": "admin", "password": "admin123"}
 
 # Instagram Posts Routes
 @api_router.get("/instagram-posts", response_model=List[InstagramPost])
+@cached_response(List[InstagramPost], "instagram_posts")
 async def get_instagram_posts():
     posts = await db.instagram_posts.find({}, {"_id": 0}).sort("created_at", -1).to_list(100)
-    for post in posts:
-        if isinstance(post['created_at'], str):
-            post['created_at'] = datetime.fromisoformat(post['created_at'])
     return posts
 
 @api_router.post("/instagram-posts", response_model=InstagramPost)
+@fast_response(InstagramPost)
+@invalidates("instagram_posts")
 async def create_instagram_post(post_data: InstagramPostCreate, admin: User = Depends(get_admin_user)):
     post = InstagramPost(**post_data.model_dump())
     doc = post.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
+    doc.update(change_stamp())
     await db.instagram_posts.insert_one(doc)
     return post
 
 @api_router.delete("/instagram-posts/{post_id}")
+@invalidates("instagram_posts")
 async def delete_instagram_post(post_id: str, admin: User = Depends(get_admin_user)):
     result = await db.instagram_posts.delete_one({"id": post_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Post not found")
+    await mark_deleted("instagram_posts", post_id)
     return {"message": "Post deleted successfully"}
 
 # ============= Copa Routes =============
 
 # Copa Groups
 @api_router.get("/copa/groups", response_model=List[CopaGroup])
+@cached_response(List[CopaGroup], "copa_groups")
 async def get_copa_groups():
     groups = await db.copa_groups.find({}, {"_id": 0}).to_list(length=None)
-    for group in groups:
-        if isinstance(group.get('created_at'), str):
-            group['created_at'] = datetime.fromisoformat(group['created_at'])
     return groups
 
 @api_router.post("/copa/groups", response_model=CopaGroup)
+@fast_response(CopaGroup)
+@invalidates("copa_groups")
 async def create_copa_group(group_data: CopaGroupCreate, admin: User = Depends(get_admin_user)):
     # Check if group already exists
     existing = await db.copa_groups.find_one({"group_name": group_data.group_name})
@@ -954,76 +1870,88 @@ async def create_copa_group(group_data: CopaGroupCreate, admin: User = Depends(g
     
     group = CopaGroup(**group_data.model_dump())
     doc = group.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
+    doc.update(change_stamp())
     await db.copa_groups.insert_one(doc)
     return group
 
 @api_router.put("/copa/groups/{group_name}")
+@invalidates("copa_groups")
 async def update_copa_group(group_name: str, group_data: CopaGroupCreate, admin: User = Depends(get_admin_user)):
     result = await db.copa_groups.update_one(
         {"group_name": group_name},
-        {"$set": {"team_ids": group_data.team_ids}}
+        {"$set": {"team_ids": group_data.team_ids, **change_stamp()}}
     )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Group not found")
     return {"message": "Group updated successfully"}
 
 @api_router.delete("/copa/groups/{group_name}")
+@invalidates("copa_groups")
 async def delete_copa_group(group_name: str, admin: User = Depends(get_admin_user)):
     result = await db.copa_groups.delete_one({"group_name": group_name})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Group not found")
+    await mark_deleted("copa_groups", group_name)
     return {"message": "Group deleted successfully"}
 
 # Copa Fixtures
 @api_router.get("/copa/fixtures", response_model=List[CopaFixture])
-async def get_copa_fixtures():
-    fixtures = await db.copa_fixtures.find({}, {"_id": 0}).to_list(length=None)
-    for fixture in fixtures:
-        if isinstance(fixture.get('match_date'), str):
-            fixture['match_date'] = datetime.fromisoformat(fixture['match_date'])
-        if isinstance(fixture.get('updated_at'), str):
-            fixture['updated_at'] = datetime.fromisoformat(fixture['updated_at'])
+@cached_response(List[CopaFixture], "copa_fixtures", "teams", variant=list_variant(CopaFixture, CopaFixtureWithTeams))
+async def get_copa_fixtures(expand: Optional[Literal["teams"]] = None, fields: Optional[str] = None):
+    field_names = parse_fields(fields, CopaFixtureWithTeams if expand else CopaFixture)
+    projection = sparse_projection(field_names, *(TEAM_ID_FIELDS if expand else ()))
+    fixtures = await db.copa_fixtures.find({}, projection).to_list(length=None)
+    if expand:
+        teams = await team_index.get()
+        for fixture in fixtures:
+            embed_team_names(fixture, teams)
     return fixtures
 
+@api_router.get("/copa/fixtures/{fixture_id}", response_model=CopaFixtureDetail)
+@fast_response(CopaFixtureDetail)
+async def get_copa_fixture(fixture_id: str):
+    return await load_match_detail(db.copa_fixtures, fixture_id)
+
 @api_router.post("/copa/fixtures", response_model=CopaFixture)
+@fast_response(CopaFixture)
+@invalidates("copa_fixtures")
 async def create_copa_fixture(fixture_data: CopaFixtureCreate, admin: User = Depends(get_admin_user)):
     fixture = CopaFixture(
         group_name=fixture_data.group_name,
         jornada=fixture_data.jornada,
         home_team_id=fixture_data.home_team_id,
         away_team_id=fixture_data.away_team_id,
-        match_date=datetime.fromisoformat(fixture_data.match_date)
+        match_date=fixture_data.match_date
     )
     doc = fixture.model_dump()
-    doc['match_date'] = doc['match_date'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
+    doc.update(change_stamp())
     await db.copa_fixtures.insert_one(doc)
     return fixture
 
 @api_router.put("/copa/fixtures/{fixture_id}")
+@invalidates("copa_fixtures")
 async def update_copa_fixture(fixture_id: str, update_data: CopaFixtureUpdate, admin: User = Depends(get_admin_user)):
     update_dict = {k: v for k, v in update_data.model_dump().items() if v is not None}
     
-    if 'match_date' in update_dict:
-        update_dict['match_date'] = datetime.fromisoformat(update_dict['match_date']).isoformat()
-    
-    update_dict['updated_at'] = datetime.now(timezone.utc).isoformat()
-    
-    result = await db.copa_fixtures.update_one({"id": fixture_id}, {"$set": update_dict})
+    result = await db.copa_fixtures.update_one({"id": fixture_id}, {"$set": {**update_dict, **change_stamp()}})
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Fixture not found")
+    publish_live("fixture_updated", "copa", fixture_id, changes=update_dict)
     return {"message": "Fixture updated successfully"}
 
 @api_router.delete("/copa/fixtures/{fixture_id}")
+@invalidates("copa_fixtures", "players")
 async def delete_copa_fixture(fixture_id: str, admin: User = Depends(get_admin_user)):
-    result = await db.copa_fixtures.delete_one({"id": fixture_id})
-    if result.deleted_count == 0:
+    fixture = await db.copa_fixtures.find_one_and_delete({"id": fixture_id}, projection={"_id": 0})
+    if fixture is None:
         raise HTTPException(status_code=404, detail="Fixture not found")
+    await mark_deleted("copa_fixtures", fixture_id)
+    await void_fixture_events("copa", fixture)
     return {"message": "Fixture deleted successfully"}
 
 # Copa Fixture - Add/Remove Scorers and Cards
 @api_router.post("/copa/fixtures/{fixture_id}/scorers")
+@invalidates("copa_fixtures", "players")
 async def add_copa_goal_scorer(fixture_id: str, scorer_data: AddGoalScorer, admin: User = Depends(get_admin_user)):
     fixture = await db.copa_fixtures.find_one({"id": fixture_id})
     if not fixture:
@@ -1036,36 +1964,31 @@ async def add_copa_goal_scorer(fixture_id: str, scorer_data: AddGoalScorer, admi
     goal = GoalScorer(player_id=scorer_data.player_id, player_name=player['name'], minute=scorer_data.minute)
     
     if scorer_data.team_side == "home":
-        await db.copa_fixtures.update_one({"id": fixture_id}, {"$push": {"home_scorers": goal.model_dump()}})
+        await db.copa_fixtures.update_one({"id": fixture_id}, {"$push": {"home_scorers": goal.model_dump()}, "$set": change_stamp()})
     else:
-        await db.copa_fixtures.update_one({"id": fixture_id}, {"$push": {"away_scorers": goal.model_dump()}})
+        await db.copa_fixtures.update_one({"id": fixture_id}, {"$push": {"away_scorers": goal.model_dump()}, "$set": change_stamp()})
     
-    await db.players.update_one({"id": scorer_data.player_id}, {"$inc": {"goals_scored": 1}})
+    await record_match_events([match_event("copa", fixture_id, scorer_data.team_side, goal.model_dump())])
+    
+    publish_live("goal_added", "copa", fixture_id, team_side=scorer_data.team_side, goal=goal.model_dump())
     
     return {"message": "Goal scorer added successfully"}
 
 @api_router.delete("/copa/fixtures/{fixture_id}/scorers")
+@invalidates("copa_fixtures", "players")
 async def remove_copa_goal_scorer(fixture_id: str, scorer_data: RemoveGoalScorer, admin: User = Depends(get_admin_user)):
-    fixture = await db.copa_fixtures.find_one({"id": fixture_id})
-    if not fixture:
-        raise HTTPException(status_code=404, detail="Fixture not found")
-    
-    scorer_list = fixture.get(f"{scorer_data.team_side}_scorers", [])
-    scorer_to_remove = next((s for s in scorer_list if s['id'] == scorer_data.goal_id), None)
-    
-    if not scorer_to_remove:
-        raise HTTPException(status_code=404, detail="Goal scorer not found")
-    
-    await db.copa_fixtures.update_one(
-        {"id": fixture_id},
-        {"$pull": {f"{scorer_data.team_side}_scorers": {"id": scorer_data.goal_id}}}
+    scorer_to_remove = await pull_fixture_item(
+        db.copa_fixtures, fixture_id, f"{scorer_data.team_side}_scorers", scorer_data.goal_id, "Goal scorer not found"
     )
     
-    await db.players.update_one({"id": scorer_to_remove['player_id']}, {"$inc": {"goals_scored": -1}})
+    await record_match_events([match_event("copa", fixture_id, scorer_data.team_side, scorer_to_remove, delta=-1)])
+    
+    publish_live("goal_removed", "copa", fixture_id, team_side=scorer_data.team_side, goal_id=scorer_data.goal_id)
     
     return {"message": "Goal scorer removed successfully"}
 
 @api_router.post("/copa/fixtures/{fixture_id}/cards")
+@invalidates("copa_fixtures", "players")
 async def add_copa_card(fixture_id: str, card_data: AddCard, admin: User = Depends(get_admin_user)):
     fixture = await db.copa_fixtures.find_one({"id": fixture_id})
     if not fixture:
@@ -1078,56 +2001,38 @@ async def add_copa_card(fixture_id: str, card_data: AddCard, admin: User = Depen
     card = Card(player_id=card_data.player_id, player_name=player['name'], card_type=card_data.card_type, minute=card_data.minute)
     
     if card_data.team_side == "home":
-        await db.copa_fixtures.update_one({"id": fixture_id}, {"$push": {"home_cards": card.model_dump()}})
+        await db.copa_fixtures.update_one({"id": fixture_id}, {"$push": {"home_cards": card.model_dump()}, "$set": change_stamp()})
     else:
-        await db.copa_fixtures.update_one({"id": fixture_id}, {"$push": {"away_cards": card.model_dump()}})
+        await db.copa_fixtures.update_one({"id": fixture_id}, {"$push": {"away_cards": card.model_dump()}, "$set": change_stamp()})
     
-    if card_data.card_type == "yellow":
-        await db.players.update_one({"id": card_data.player_id}, {"$inc": {"yellow_cards": 1}})
-    else:
-        await db.players.update_one({"id": card_data.player_id}, {"$inc": {"red_cards": 1}})
+    await record_match_events([match_event("copa", fixture_id, card_data.team_side, card.model_dump())])
+    
+    sanctions_refresher.schedule(card_data.player_id)
+    
+    publish_live("card_added", "copa", fixture_id, team_side=card_data.team_side, card=card.model_dump())
     
     return {"message": "Card added successfully"}
 
 @api_router.delete("/copa/fixtures/{fixture_id}/cards")
+@invalidates("copa_fixtures", "players")
 async def remove_copa_card(fixture_id: str, card_data: RemoveCard, admin: User = Depends(get_admin_user)):
-    fixture = await db.copa_fixtures.find_one({"id": fixture_id})
-    if not fixture:
-        raise HTTPException(status_code=404, detail="Fixture not found")
-    
-    card_list = fixture.get(f"{card_data.team_side}_cards", [])
-    card_to_remove = next((c for c in card_list if c['id'] == card_data.card_id), None)
+    card_to_remove = await pull_fixture_item(
+        db.copa_fixtures, fixture_id, f"{card_data.team_side}_cards", card_data.card_id, "Card not found"
+    )
     
-    if not card_to_remove:
-        raise HTTPException(status_code=404, detail="Card not found")
+    await record_match_events([match_event("copa", fixture_id, card_data.team_side, card_to_remove, delta=-1)])
     
-    await db.copa_fixtures.update_one(
-        {"id": fixture_id},
-        {"$pull": {f"{card_data.team_side}_cards": {"id": card_data.card_id}}}
-    )
+    sanctions_refresher.schedule(card_to_remove['player_id'])
     
-    if card_to_remove['card_type'] == "yellow":
-        await db.players.update_one({"id": card_to_remove['player_id']}, {"$inc": {"yellow_cards": -1}})
-    else:
-        await db.players.update_one({"id": card_to_remove['player_id']}, {"$inc": {"red_cards": -1}})
+    publish_live("card_removed", "copa", fixture_id, team_side=card_data.team_side, card_id=card_data.card_id)
     
     return {"message": "Card removed successfully"}
 
 # Copa Standings
-@api_router.get("/copa/standings/{group_name}", response_model=List[CopaStandingsRow])
-async def get_copa_standings(group_name: str):
-    # Get group teams
-    group = await db.copa_groups.find_one({"group_name": group_name})
-    if not group:
-        raise HTTPException(status_code=404, detail="Group not found")
-    
-    # Get fixtures for this group
-    fixtures = await db.copa_fixtures.find({"group_name": group_name, "status": "completed"}, {"_id": 0}).to_list(length=None)
-    
-    # Calculate standings
+def compute_copa_group_standings(team_ids: List[str], fixtures: List[dict], teams_by_id: dict) -> List[CopaStandingsRow]:
     standings = {}
-    for team_id in group['team_ids']:
-        team = await db.teams.find_one({"id": team_id})
+    for team_id in team_ids:
+        team = teams_by_id.get(team_id)
         if team:
             standings[team_id] = {
                 "team_id": team_id,
@@ -1144,8 +2049,8 @@ async def get_copa_standings(group_name: str):
     for fixture in fixtures:
         home_id = fixture['home_team_id']
         away_id = fixture['away_team_id']
-        home_score = fixture.get('home_score', 0)
-        away_score = fixture.get('away_score', 0)
+        home_score = fixture.get('home_score') or 0
+        away_score = fixture.get('away_score') or 0
         
         if home_id in standings:
             standings[home_id]['games_played'] += 1
@@ -1186,59 +2091,104 @@ async def get_copa_standings(group_name: str):
     
     return [CopaStandingsRow(**row) for row in standings_list]
 
+async def get_copa_teams_by_id(groups: List[dict]) -> dict:
+    team_ids = list({team_id for group in groups for team_id in group.get('team_ids', [])})
+    teams = await db.teams.find({"id": {"$in": team_ids}}, {"_id": 0, "id": 1, "name": 1}).to_list(None)
+    return {team['id']: team for team in teams}
+
+@api_router.get("/copa/standings", response_model=Dict[str, List[CopaStandingsRow]])
+@cached_response(Dict[str, List[CopaStandingsRow]], "copa_groups", "copa_fixtures", "teams")
+async def get_all_copa_standings():
+    groups = await db.copa_groups.find({}, {"_id": 0, "group_name": 1, "team_ids": 1}).to_list(None)
+    fixtures = await db.copa_fixtures.find(
+        {"status": "completed"},
+        {"_id": 0, "group_name": 1, "home_team_id": 1, "away_team_id": 1, "home_score": 1, "away_score": 1}
+    ).to_list(None)
+    teams_by_id = await get_copa_teams_by_id(groups)
+    
+    fixtures_by_group = {}
+    for fixture in fixtures:
+        fixtures_by_group.setdefault(fixture['group_name'], []).append(fixture)
+    
+    return {
+        group['group_name']: compute_copa_group_standings(
+            group.get('team_ids', []), fixtures_by_group.get(group['group_name'], []), teams_by_id
+        )
+        for group in sorted(groups, key=lambda g: g['group_name'])
+    }
+
+@api_router.get("/copa/standings/{group_name}", response_model=List[CopaStandingsRow])
+@cached_response(List[CopaStandingsRow], "copa_groups", "copa_fixtures", "teams")
+async def get_copa_standings(group_name: str):
+    # Get group teams
+    group = await db.copa_groups.find_one({"group_name": group_name})
+    if not group:
+        raise HTTPException(status_code=404, detail="Group not found")
+    
+    # Get fixtures for this group
+    fixtures = await db.copa_fixtures.find({"group_name": group_name, "status": "completed"}, {"_id": 0}).to_list(length=None)
+    teams_by_id = await get_copa_teams_by_id([group])
+    
+    return compute_copa_group_standings(group['team_ids'], fixtures, teams_by_id)
+
 # Copa Brackets
 @api_router.get("/copa/brackets", response_model=List[CopaBracket])
-async def get_copa_brackets():
-    brackets = await db.copa_brackets.find({}, {"_id": 0}).to_list(length=None)
-    for bracket in brackets:
-        if isinstance(bracket.get('match_date'), str):
-            bracket['match_date'] = datetime.fromisoformat(bracket['match_date'])
-        if isinstance(bracket.get('created_at'), str):
-            bracket['created_at'] = datetime.fromisoformat(bracket['created_at'])
-        if isinstance(bracket.get('updated_at'), str):
-            bracket['updated_at'] = datetime.fromisoformat(bracket['updated_at'])
+@cached_response(List[CopaBracket], "copa_brackets", "teams", variant=list_variant(CopaBracket, CopaBracketWithTeams))
+async def get_copa_brackets(expand: Optional[Literal["teams"]] = None, fields: Optional[str] = None):
+    field_names = parse_fields(fields, CopaBracketWithTeams if expand else CopaBracket)
+    projection = sparse_projection(field_names, *(TEAM_ID_FIELDS if expand else ()))
+    brackets = await db.copa_brackets.find({}, projection).to_list(length=None)
+    if expand:
+        teams = await team_index.get()
+        for bracket in brackets:
+            embed_team_names(bracket, teams)
     return brackets
 
+@api_router.get("/copa/brackets/{bracket_id}", response_model=CopaBracketDetail)
+@fast_response(CopaBracketDetail)
+async def get_copa_bracket(bracket_id: str):
+    return await load_match_detail(db.copa_brackets, bracket_id, "Bracket not found")
+
 @api_router.post("/copa/brackets", response_model=CopaBracket)
+@fast_response(CopaBracket)
+@invalidates("copa_brackets")
 async def create_copa_bracket(bracket_data: CopaBracketCreate, admin: User = Depends(get_admin_user)):
     bracket = CopaBracket(
         round_type=bracket_data.round_type,
         match_position=bracket_data.match_position,
         home_team_id=bracket_data.home_team_id,
         away_team_id=bracket_data.away_team_id,
-        match_date=datetime.fromisoformat(bracket_data.match_date) if bracket_data.match_date else None
+        match_date=bracket_data.match_date
     )
     doc = bracket.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
-    if doc.get('match_date'):
-        doc['match_date'] = doc['match_date'].isoformat()
+    doc.update(change_stamp())
     await db.copa_brackets.insert_one(doc)
     return bracket
 
 @api_router.put("/copa/brackets/{bracket_id}")
+@invalidates("copa_brackets")
 async def update_copa_bracket(bracket_id: str, update_data: CopaBracketUpdate, admin: User = Depends(get_admin_user)):
     update_dict = {k: v for k, v in update_data.model_dump().items() if v is not None}
     
-    if 'match_date' in update_dict and update_dict['match_date']:
-        update_dict['match_date'] = datetime.fromisoformat(update_dict['match_date']).isoformat()
-    
-    update_dict['updated_at'] = datetime.now(timezone.utc).isoformat()
-    
-    result = await db.copa_brackets.update_one({"id": bracket_id}, {"$set": update_dict})
+    result = await db.copa_brackets.update_one({"id": bracket_id}, {"$set": {**update_dict, **change_stamp()}})
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Bracket not found")
+    publish_live("fixture_updated", "bracket", bracket_id, changes=update_dict)
     return {"message": "Bracket updated successfully"}
 
 @api_router.delete("/copa/brackets/{bracket_id}")
+@invalidates("copa_brackets", "players")
 async def delete_copa_bracket(bracket_id: str, admin: User = Depends(get_admin_user)):
-    result = await db.copa_brackets.delete_one({"id": bracket_id})
-    if result.deleted_count == 0:
+    bracket = await db.copa_brackets.find_one_and_delete({"id": bracket_id}, projection={"_id": 0})
+    if bracket is None:
         raise HTTPException(status_code=404, detail="Bracket not found")
+    await mark_deleted("copa_brackets", bracket_id)
+    await void_fixture_events("bracket", bracket)
     return {"message": "Bracket deleted successfully"}
 
 # Copa Bracket - Add/Remove Scorers and Cards
 @api_router.post("/copa/brackets/{bracket_id}/scorers")
+@invalidates("copa_brackets", "players")
 async def add_copa_bracket_goal_scorer(bracket_id: str, scorer_data: AddGoalScorer, admin: User = Depends(get_admin_user)):
     bracket = await db.copa_brackets.find_one({"id": bracket_id})
     if not bracket:
@@ -1251,15 +2201,18 @@ async def add_copa_bracket_goal_scorer(bracket_id: str, scorer_data: AddGoalScor
     goal = GoalScorer(player_id=scorer_data.player_id, player_name=player['name'], minute=scorer_data.minute)
     
     if scorer_data.team_side == "home":
-        await db.copa_brackets.update_one({"id": bracket_id}, {"$push": {"home_scorers": goal.model_dump()}})
+        await db.copa_brackets.update_one({"id": bracket_id}, {"$push": {"home_scorers": goal.model_dump()}, "$set": change_stamp()})
     else:
-        await db.copa_brackets.update_one({"id": bracket_id}, {"$push": {"away_scorers": goal.model_dump()}})
+        await db.copa_brackets.update_one({"id": bracket_id}, {"$push": {"away_scorers": goal.model_dump()}, "$set": change_stamp()})
+    
+    await record_match_events([match_event("bracket", bracket_id, scorer_data.team_side, goal.model_dump())])
     
-    await db.players.update_one({"id": scorer_data.player_id}, {"$inc": {"goals_scored": 1}})
+    publish_live("goal_added", "bracket", bracket_id, team_side=scorer_data.team_side, goal=goal.model_dump())
     
     return {"message": "Goal scorer added successfully"}
 
 @api_router.post("/copa/brackets/{bracket_id}/cards")
+@invalidates("copa_brackets", "players")
 async def add_copa_bracket_card(bracket_id: str, card_data: AddCard, admin: User = Depends(get_admin_user)):
     bracket = await db.copa_brackets.find_one({"id": bracket_id})
     if not bracket:
@@ -1272,111 +2225,96 @@ async def add_copa_bracket_card(bracket_id: str, card_data: AddCard, admin: User
     card = Card(player_id=card_data.player_id, player_name=player['name'], card_type=card_data.card_type, minute=card_data.minute)
     
     if card_data.team_side == "home":
-        await db.copa_brackets.update_one({"id": bracket_id}, {"$push": {"home_cards": card.model_dump()}})
+        await db.copa_brackets.update_one({"id": bracket_id}, {"$push": {"home_cards": card.model_dump()}, "$set": change_stamp()})
     else:
-        await db.copa_brackets.update_one({"id": bracket_id}, {"$push": {"away_cards": card.model_dump()}})
+        await db.copa_brackets.update_one({"id": bracket_id}, {"$push": {"away_cards": card.model_dump()}, "$set": change_stamp()})
     
-    if card_data.card_type == "yellow":
-        await db.players.update_one({"id": card_data.player_id}, {"$inc": {"yellow_cards": 1}})
-    else:
-        await db.players.update_one({"id": card_data.player_id}, {"$inc": {"red_cards": 1}})
+    await record_match_events([match_event("bracket", bracket_id, card_data.team_side, card.model_dump())])
+    
+    sanctions_refresher.schedule(card_data.player_id)
+    
+    publish_live("card_added", "bracket", bracket_id, team_side=card_data.team_side, card=card.model_dump())
     
     return {"message": "Card added successfully"}
 
 # ============= Sanctions Routes =============
+# The sanctions collection is a materialized view of every carded player. Card
+# events schedule a refresh of the affected players; the refresher batches the
+# pending ids into one bulk upsert so the public GET stays a plain read.
+
+async def refresh_sanctions(player_ids: Optional[List[str]] = None) -> int:
+    """Upsert sanction rows for the given players, or for every carded player."""
+    count = await refresh_sanction_rows(db, player_ids, stamp=change_stamp())
+    if count:
+        bump_versions("sanctions")
+    return count
+
+class SanctionsRefresher:
+    """Coalesces card events into background bulk refreshes of the sanctions view."""
+    
+    def __init__(self):
+        self.pending = set()
+        self.task = None
+    
+    def schedule(self, *player_ids: str):
+        self.pending.update(player_ids)
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self._drain())
+    
+    async def _drain(self):
+        while self.pending:
+            batch = list(self.pending)
+            self.pending.clear()
+            try:
+                await refresh_sanctions(batch)
+            except Exception:
+                logger.exception("Failed to refresh sanctions")
+    
+    async def flush(self):
+        if self.task is not None:
+            await self.task
+
+sanctions_refresher = SanctionsRefresher()
 
 @api_router.get("/sanctions", response_model=List[Sanction])
+@cached_response(List[Sanction], "sanctions")
 async def get_sanctions():
-    # Get all players with yellow or red cards
-    players = await db.players.find(
-        {"$or": [{"yellow_cards": {"$gt": 0}}, {"red_cards": {"$gt": 0}}]},
+    sanctions = await db.sanctions.find(
+        {"$or": [{"total_yellow_cards": {"$gt": 0}}, {"total_red_cards": {"$gt": 0}}]},
         {"_id": 0}
     ).to_list(length=None)
     
-    sanctions = []
-    for player in players:
-        # Get team info
-        team = await db.teams.find_one({"id": player['team_id']})
-        if not team:
-            continue
-        
-        # Check if sanction record exists
-        sanction_doc = await db.sanctions.find_one({"player_id": player['id']})
-        
-        if sanction_doc:
-            if isinstance(sanction_doc.get('created_at'), str):
-                sanction_doc['created_at'] = datetime.fromisoformat(sanction_doc['created_at'])
-            if isinstance(sanction_doc.get('updated_at'), str):
-                sanction_doc['updated_at'] = datetime.fromisoformat(sanction_doc['updated_at'])
-            # Ensure division is included
-            if 'division' not in sanction_doc:
-                sanction_doc['division'] = team.get('division', 1)
-            sanctions.append(Sanction(**sanction_doc))
-        else:
-            # Create sanction record from player data
-            sanction = Sanction(
-                player_id=player['id'],
-                player_name=player['name'],
-                team_id=player['team_id'],
-                team_name=team['name'],
-                division=team.get('division', 1),
-                card_type="red" if player.get('red_cards', 0) > 0 else "yellow",
-                total_yellow_cards=player.get('yellow_cards', 0),
-                total_red_cards=player.get('red_cards', 0)
-            )
-            # Save to database
-            doc = sanction.model_dump()
-            doc['created_at'] = doc['created_at'].isoformat()
-            doc['updated_at'] = doc['updated_at'].isoformat()
-            await db.sanctions.insert_one(doc)
-            sanctions.append(sanction)
+    for sanction in sanctions:
+        # Ensure division is included
+        sanction.setdefault('division', 1)
     
     return sanctions
 
 @api_router.put("/sanctions/{player_id}")
+@invalidates("sanctions")
 async def update_sanction(player_id: str, sanction_data: SanctionUpdate, admin: User = Depends(get_admin_user)):
-    # Get player and team info
-    player = await db.players.find_one({"id": player_id})
+    player = await db.players.find_one({"id": player_id}, {"_id": 0, "team_id": 1})
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     
-    team = await db.teams.find_one({"id": player['team_id']})
-    if not team:
+    # Make sure the row exists with current totals before applying the admin fields
+    if await refresh_sanctions([player_id]) == 0:
         raise HTTPException(status_code=404, detail="Team not found")
     
-    # Check if sanction exists
-    sanction = await db.sanctions.find_one({"player_id": player_id})
-    
     update_dict = {k: v for k, v in sanction_data.model_dump().items() if v is not None}
-    update_dict['updated_at'] = datetime.now(timezone.utc).isoformat()
-    
-    if sanction:
-        # Update existing sanction
-        await db.sanctions.update_one({"player_id": player_id}, {"$set": update_dict})
-    else:
-        # Create new sanction record
-        new_sanction = Sanction(
-            player_id=player['id'],
-            player_name=player['name'],
-            team_id=player['team_id'],
-            team_name=team['name'],
-            card_type="red" if player.get('red_cards', 0) > 0 else "yellow",
-            total_yellow_cards=player.get('yellow_cards', 0),
-            total_red_cards=player.get('red_cards', 0),
-            **update_dict
-        )
-        doc = new_sanction.model_dump()
-        doc['created_at'] = doc['created_at'].isoformat()
-        doc['updated_at'] = doc['updated_at'].isoformat()
-        await db.sanctions.insert_one(doc)
+    await db.sanctions.update_one({"player_id": player_id}, {"$set": {**update_dict, **change_stamp()}})
     
     return {"message": "Sanction updated successfully"}
 
 @api_router.delete("/sanctions/{player_id}")
+@invalidates("sanctions")
 async def delete_sanction(player_id: str, admin: User = Depends(get_admin_user)):
     result = await db.sanctions.delete_one({"player_id": player_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Sanction not found")
+    await mark_deleted("sanctions", player_id)
+    # A carded player keeps a row; deleting resets its suspension details
+    await refresh_sanctions([player_id])
     return {"message": "Sanction deleted successfully"}
 
 # Include the router in the main app
@@ -1388,6 +2326,7 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count"],
 )
 
 # Configure logging
@@ -1397,6 +2336,41 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def apply_migrations():
+    applied = await run_migrations(db)
+    if applied:
+        logger.info(f"Applied migrations {applied}")
+
+@app.on_event("startup")
+async def init_standings():
+    # Populate the materialized table on first start against an existing database,
+    # and rebuild it when rows are missing or were written in an older shape
+    malformed = {"$or": [{field: {"$exists": False}} for field in ("team_name", *STANDINGS_COUNTERS)]}
+    if (
+        await db.standings.count_documents({}) != await db.teams.count_documents({})
+        or await db.standings.count_documents(malformed, limit=1) > 0
+    ):
+        count = await rebuild_standings()
+        logger.info(f"Built standings for {count} teams")
+
+@app.on_event("startup")
+async def init_sanctions():
+    count = await refresh_sanctions()
+    logger.info(f"Refreshed sanctions for {count} players")
+
+@app.on_event("startup")
+async def start_change_feed():
+    change_feed.start()
+
+@app.on_event("startup")
+async def start_reconciler():
+    reconciler.start_schedule()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await change_feed.stop()
+    await reconciler.stop()
+    await sanctions_refresher.flush()
+    password_hash_executor.shutdown(wait=False)
     client.close()
\ No newline at end of file
@@ -147,7 +147,7 @@ const AdminDashboard = ({ user, setUser }) => {
         setTeams(teamsRes.data);
       } else if (activeTab === "fixtures") {
         const [fixturesRes, teamsRes] = await Promise.all([
-          api.get("/fixtures"),
+          api.get("/fixtures?fields=division,week_number,home_team_id,away_team_id,home_score,away_score,status"),
           api.get("/teams"),
         ]);
         setFixtures(fixturesRes.data);
@@ -165,7 +165,7 @@ const AdminDashboard = ({ user, setUser }) => {
       } else if (activeTab === "copa") {
         const [groupsRes, fixturesRes, bracketsRes, teamsRes] = await Promise.all([
           api.get("/copa/groups"),
-          api.get("/copa/fixtures"),
+          api.get("/copa/fixtures?fields=group_name,jornada,home_team_id,away_team_id,home_score,away_score,status"),
           api.get("/copa/brackets"),
           api.get("/teams"),
         ]);
@@ -47,29 +47,23 @@ const AdminFixtureEdit = ({ user, setUser }) => {
   const fetchData = async () => {
     setLoading(true);
     try {
-      const [fixturesRes, teamsRes, playersRes] = await Promise.all([
-        api.get("/fixtures"),
-        api.get("/teams"),
-        api.get("/players"),
-      ]);
-
-      const currentFixture = fixturesRes.data.find((f) => f.id === fixtureId);
-      if (!currentFixture) {
-        toast.error("Fixture not found");
-        navigate("/admin");
-        return;
-      }
+      const { data } = await api.get(`/fixtures/${fixtureId}`);
+      const currentFixture = data.fixture;
       setFixture(currentFixture);
       setHomeScore(currentFixture.home_score || "");
       setAwayScore(currentFixture.away_score || "");
 
-      const teamsMap = {};
-      teamsRes.data.forEach((team) => {
-        teamsMap[team.id] = team;
+      setTeams({
+        [currentFixture.home_team_id]: data.home_team,
+        [currentFixture.away_team_id]: data.away_team,
       });
-      setTeams(teamsMap);
-      setPlayers(playersRes.data);
+      setPlayers([...data.home_roster, ...data.away_roster]);
     } catch (error) {
+      if (error.response?.status === 404) {
+        toast.error("Fixture not found");
+        navigate("/admin");
+        return;
+      }
       toast.error("Failed to load data");
     } finally {
       setLoading(false);
@@ -35,29 +35,19 @@ const CopaPage = () => {
   const fetchData = async () => {
     setLoading(true);
     try {
-      const [groupsRes, teamsRes, fixturesRes, bracketsRes] = await Promise.all([
+      const [groupsRes, teamsRes, fixturesRes, bracketsRes, standingsRes] = await Promise.all([
         api.get("/copa/groups"),
         api.get("/teams"),
         api.get("/copa/fixtures"),
         api.get("/copa/brackets"),
+        api.get("/copa/standings"),
       ]);
 
       setGroups(groupsRes.data);
       setTeams(teamsRes.data);
       setFixtures(fixturesRes.data);
       setBrackets(bracketsRes.data);
-
-      // Fetch standings for all groups
-      const standingsData = {};
-      for (const group of groupsRes.data) {
-        try {
-          const standingsRes = await api.get(`/copa/standings/${group.group_name}`);
-          standingsData[group.group_name] = standingsRes.data;
-        } catch (error) {
-          standingsData[group.group_name] = [];
-        }
-      }
-      setStandings(standingsData);
+      setStandings(standingsRes.data);
     } catch (error) {
       toast.error("Failed to load Copa data");
       console.error(error);
@@ -11,7 +11,7 @@ import {
   SelectTrigger,
   SelectValue,
 } from "@/components/ui/select";
-import { api } from "../App";
+import { api, API } from "../App";
 import { toast } from "sonner";
 import SharedNavigation from "../components/SharedNavigation";
 import { useTranslation } from "react-i18next";
@@ -32,6 +32,19 @@ const FixturesPage = () => {
     fetchData();
   }, [division]);
 
+  useEffect(() => {
+    // Apply live score events pushed by the server
+    const source = new EventSource(`${API}/live/fixtures`);
+    let connected = false;
+    source.onopen = () => {
+      // Events may have been missed while reconnecting
+      if (connected) fetchData();
+      connected = true;
+    };
+    source.onmessage = (message) => applyLiveEvent(JSON.parse(message.data));
+    return () => source.close();
+  }, [division]);
+
   useEffect(() => {
     // Update time every minute for live matches
     const timer = setInterval(() => {
@@ -44,16 +57,15 @@ const FixturesPage = () => {
   const fetchData = async () => {
     setLoading(true);
     try {
-      const [fixturesRes, teamsRes] = await Promise.all([
-        api.get(`/fixtures/division/${division}`),
-        api.get("/teams"),
-      ]);
+      const fixturesRes = await api.get(`/fixtures/division/${division}?expand=teams`);
 
       setFixtures(fixturesRes.data);
       
+      // Team names and logos come embedded in each fixture
       const teamsMap = {};
-      teamsRes.data.forEach((team) => {
-        teamsMap[team.id] = team;
+      fixturesRes.data.forEach((fixture) => {
+        teamsMap[fixture.home_team_id] = { id: fixture.home_team_id, name: fixture.home_team_name, logo_url: fixture.home_team_logo };
+        teamsMap[fixture.away_team_id] = { id: fixture.away_team_id, name: fixture.away_team_name, logo_url: fixture.away_team_logo };
       });
       setTeams(teamsMap);
     } catch (error) {
@@ -63,6 +75,33 @@ const FixturesPage = () => {
     }
   };
 
+  const applyLiveEvent = (event) => {
+    if (event.competition !== "liga") return;
+    setFixtures((current) =>
+      current.map((fixture) => {
+        if (fixture.id !== event.fixture_id) return fixture;
+        const scorersField = `${event.team_side}_scorers`;
+        const cardsField = `${event.team_side}_cards`;
+        switch (event.type) {
+          case "fixture_updated":
+            return { ...fixture, ...event.changes };
+          case "fixture_changed":
+            return { ...fixture, ...event.fixture };
+          case "goal_added":
+            return { ...fixture, [scorersField]: [...fixture[scorersField], event.goal] };
+          case "goal_removed":
+            return { ...fixture, [scorersField]: fixture[scorersField].filter((g) => g.id !== event.goal_id) };
+          case "card_added":
+            return { ...fixture, [cardsField]: [...fixture[cardsField], event.card] };
+          case "card_removed":
+            return { ...fixture, [cardsField]: fixture[cardsField].filter((c) => c.id !== event.card_id) };
+          default:
+            return fixture;
+        }
+      })
+    );
+  };
+
   const getMatchMinute = (matchDate) => {
     const match = new Date(matchDate);
     const now = currentTime;
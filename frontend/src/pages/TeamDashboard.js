@@ -36,25 +36,19 @@ const TeamDashboard = ({ user, setUser }) => {
   const fetchData = async () => {
     setLoading(true);
     try {
-      const [fixturesRes, teamsRes, playersRes] = await Promise.all([
-        api.get("/fixtures"),
-        api.get("/teams"),
-        api.get("/players"),
-      ]);
-
-      // Filter fixtures for user's team
-      const teamFixtures = fixturesRes.data.filter(
-        (f) => f.home_team_id === user.team_id || f.away_team_id === user.team_id
-      );
-      setFixtures(teamFixtures);
+      const { data } = await api.get(`/teams/${user.team_id}/dashboard`);
+      setFixtures(data.fixtures);
 
+      // Opponent names come embedded in each fixture
       const teamsMap = {};
-      teamsRes.data.forEach((team) => {
-        teamsMap[team.id] = team;
+      data.fixtures.forEach((fixture) => {
+        teamsMap[fixture.home_team_id] = { id: fixture.home_team_id, name: fixture.home_team_name };
+        teamsMap[fixture.away_team_id] = { id: fixture.away_team_id, name: fixture.away_team_name };
       });
+      teamsMap[data.team.id] = data.team;
       setTeams(teamsMap);
 
-      setPlayers(playersRes.data);
+      setPlayers(data.roster);
     } catch (error) {
       toast.error("Failed to load data");
     } finally {
@@ -0,0 +1,129 @@
+"""
+Micro-benchmark of per-route response serialization.
+
+Compares FastAPI's default path (response_model validation followed by the
+stdlib JSON encoder), the same validation with orjson encoding, and the fast
+path used by cached_response/fast_response (one cached TypeAdapter that
+validates and encodes in pydantic-core).
+
+    python scripts/benchmark_serialization.py [fixtures] [repeats]
+"""
+
+import os
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "benchmark")
+
+import anyio
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from server import Fixture, FixtureWithTeams, Player, response_adapter
+
+
+def goal(minute: int) -> dict:
+    return {"id": str(uuid.uuid4()), "player_id": str(uuid.uuid4()), "player_name": "Jugador", "minute": minute}
+
+
+def card(minute: int, card_type: str) -> dict:
+    return {**goal(minute), "card_type": card_type}
+
+
+def fixtures(count: int) -> List[dict]:
+    start = datetime(2025, 9, 6, 17, 0)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "division": 1 + i % 2,
+            "week_number": 1 + i // 12,
+            "home_team_id": str(uuid.uuid4()),
+            "away_team_id": str(uuid.uuid4()),
+            "home_score": 2,
+            "away_score": 1,
+            "match_date": start + timedelta(days=7 * (i // 12)),
+            "status": "completed",
+            "home_scorers": [goal(12), goal(58)],
+            "away_scorers": [goal(71)],
+            "home_cards": [card(30, "yellow")],
+            "away_cards": [card(44, "yellow"), card(88, "red")],
+            "updated_at": start,
+        }
+        for i in range(count)
+    ]
+
+
+def with_teams(docs: List[dict]) -> List[dict]:
+    return [
+        {
+            **doc,
+            "home_team_name": "S.D. COSMOS", "home_team_logo": None,
+            "away_team_name": "BAR SORIA", "away_team_logo": None,
+        }
+        for doc in docs
+    ]
+
+
+def players(count: int) -> List[dict]:
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"Jugador {i}",
+            "team_id": str(uuid.uuid4()),
+            "jersey_number": i % 25,
+            "goals_scored": i % 7,
+            "yellow_cards": i % 3,
+            "red_cards": 0,
+            "created_at": datetime.now(timezone.utc),
+        }
+        for i in range(count)
+    ]
+
+
+def default_path(response_class, response_type, docs):
+    field = create_response_field(name="Response", type_=response_type, mode="serialization")
+
+    def run():
+        content = anyio.run(lambda: serialize_response(field=field, response_content=docs))
+        return response_class(content).body
+    return run
+
+
+def fast_path(response_type, docs):
+    adapter = response_adapter(response_type)
+    return lambda: adapter.dump_json(adapter.validate_python(docs))
+
+
+def main(count: int, repeats: int):
+    fixture_docs = fixtures(count)
+    routes = [
+        ("GET /fixtures", List[Fixture], fixture_docs),
+        ("GET /fixtures?expand=teams", List[FixtureWithTeams], with_teams(fixture_docs)),
+        ("GET /players", List[Player], players(count)),
+    ]
+    print(f"{count} documents per response, best of {repeats} runs (ms per response)")
+    print(f"{'route':32} {'default':>10} {'orjson':>10} {'fast':>10} {'speedup':>8}")
+    for route, response_type, docs in routes:
+        timings = []
+        for run in (
+            default_path(JSONResponse, response_type, docs),
+            default_path(ORJSONResponse, response_type, docs),
+            fast_path(response_type, docs),
+        ):
+            timings.append(min(timeit.repeat(run, number=1, repeat=repeats)) * 1000)
+        default, orjson_only, fast = timings
+        print(f"{route:32} {default:10.2f} {orjson_only:10.2f} {fast:10.2f} {default / fast:7.1f}x")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+    )
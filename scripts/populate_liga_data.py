@@ -1,7 +1,7 @@
 import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
 
 # MongoDB connection
@@ -204,31 +204,12 @@ async def populate_database():
             "name": team_data["name"],
             "division": team_data["division"],
             "logo_url": None,
-            "created_at": datetime.now().isoformat()
+            "created_at": datetime.now(timezone.utc)
         }
         await db.teams.insert_one(team)
         team_mapping[team_data["name"]] = team_id
         print(f"   ✓ Created {team_data['name']} (Division {team_data['division']})")
     
-    # Create standings for all teams
-    print("\n📊 Creating standings...")
-    for team_data in all_teams:
-        team_id = team_mapping[team_data["name"]]
-        standing = {
-            "id": str(uuid.uuid4()),
-            "team_id": team_id,
-            "division": team_data["division"],
-            "played": team_data.get("pj", 0),
-            "won": team_data.get("pg", 0),
-            "drawn": team_data.get("pe", 0),
-            "lost": team_data.get("pp", 0),
-            "goals_for": team_data.get("gf", 0),
-            "goals_against": team_data.get("gc", 0),
-            "points": team_data.get("pts", 0)
-        }
-        await db.standings.insert_one(standing)
-        print(f"   ✓ Standing for {team_data['name']}: {team_data.get('pts', 0)} pts")
-    
     # Create fixtures for Division 1
     print("\n⚽ Creating Division 1 fixtures...")
     for fixture_data in division_1_fixtures:
@@ -244,13 +225,13 @@ async def populate_database():
             "away_team_id": away_team_id,
             "home_score": fixture_data.get("home_score"),
             "away_score": fixture_data.get("away_score"),
-            "match_date": datetime.strptime(fixture_data["date"], "%Y-%m-%d").isoformat(),
+            "match_date": datetime.strptime(fixture_data["date"], "%Y-%m-%d"),
             "status": "completed" if fixture_data.get("home_score") is not None else "scheduled",
             "home_scorers": [],
             "away_scorers": [],
             "home_cards": [],
             "away_cards": [],
-            "updated_at": datetime.now().isoformat()
+            "updated_at": datetime.now(timezone.utc)
         }
         await db.fixtures.insert_one(fixture)
         status_emoji = "✅" if fixture["status"] == "completed" else "📅"
@@ -272,13 +253,13 @@ async def populate_database():
             "away_team_id": away_team_id,
             "home_score": fixture_data.get("home_score"),
             "away_score": fixture_data.get("away_score"),
-            "match_date": datetime.strptime(fixture_data["date"], "%Y-%m-%d").isoformat(),
+            "match_date": datetime.strptime(fixture_data["date"], "%Y-%m-%d"),
             "status": "completed" if fixture_data.get("home_score") is not None else "scheduled",
             "home_scorers": [],
             "away_scorers": [],
             "home_cards": [],
             "away_cards": [],
-            "updated_at": datetime.now().isoformat()
+            "updated_at": datetime.now(timezone.utc)
         }
         await db.fixtures.insert_one(fixture)
         status_emoji = "✅" if fixture["status"] == "completed" else "📅"
@@ -287,12 +268,12 @@ async def populate_database():
     
     print("\n✅ Database population complete!")
     print(f"   📊 Total teams created: {len(all_teams)}")
-    print(f"   📈 Total standings entries: {len(all_teams)}")
     print(f"   📅 Total fixtures created: {len(division_1_fixtures) + len(division_2_fixtures)}")
     print(f"   ✅ Completed fixtures (Division 1): {sum(1 for f in division_1_fixtures if f.get('home_score') is not None)}")
     print(f"   ✅ Completed fixtures (Division 2): {sum(1 for f in division_2_fixtures if f.get('home_score') is not None)}")
     print(f"   📅 Scheduled fixtures (Division 1): {sum(1 for f in division_1_fixtures if f.get('home_score') is None)}")
     print(f"   📅 Scheduled fixtures (Division 2): {sum(1 for f in division_2_fixtures if f.get('home_score') is None)}")
+    print("\n📊 Standings are built by the API: on its next start, or right away with POST /api/standings/rebuild")
     print("\n🎉 Liga Veteranos Logroño data is ready!")
 
 if __name__ == "__main__":
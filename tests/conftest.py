@@ -0,0 +1,76 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test_database")
+os.environ["CHANGE_FEED"] = "off"
+os.environ["RECONCILE_INTERVAL_SECONDS"] = "0"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from mongomock_motor import AsyncMongoMockClient  # noqa: E402
+
+import match_events  # noqa: E402
+import server  # noqa: E402
+
+
+async def recorded_fixture_events(db) -> dict:
+    # mongomock has no $unionWith, so each competition is aggregated on its own
+    events = {}
+    for competition, name in match_events.COMPETITION_COLLECTIONS.items():
+        async for event in db[name].aggregate(match_events._fixture_events_stage(competition)):
+            events[event["event_id"]] = event
+    return events
+
+
+@pytest.fixture
+def client(monkeypatch):
+    mongo = AsyncMongoMockClient()
+    db = mongo["test_database"]
+    monkeypatch.setattr(server, "client", mongo)
+    monkeypatch.setattr(server, "db", db)
+    monkeypatch.setattr(server.change_feed, "db", db)
+    monkeypatch.setattr(server, "team_index", server.TeamIndex())
+    monkeypatch.setattr(server, "password_hash_executor", ThreadPoolExecutor(max_workers=1))
+    monkeypatch.setattr(match_events, "recorded_fixture_events", recorded_fixture_events)
+    server.collection_versions.clear()
+    server.response_cache.entries.clear()
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db(client):
+    return server.db
+
+
+@pytest.fixture
+def run(client):
+    """Run a coroutine function on the app's event loop."""
+    return lambda func, *args: client.portal.call(func, *args)
+
+
+@pytest.fixture
+def admin(client):
+    client.post("/api/init-admin")
+    response = client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def league(client, admin):
+    """Two division-1 teams with one player each and a scheduled fixture between them."""
+    teams = [client.post("/api/teams", json={"name": name, "division": 1}, headers=admin).json()["id"] for name in "AB"]
+    players = [
+        client.post("/api/players", json={"name": name, "team_id": team_id}, headers=admin).json()["id"]
+        for name, team_id in zip("xy", teams)
+    ]
+    fixture = client.post("/api/fixtures", json={
+        "division": 1, "week_number": 1, "home_team_id": teams[0], "away_team_id": teams[1],
+        "match_date": "2025-09-06T17:00:00",
+    }, headers=admin).json()["id"]
+    return {"teams": teams, "players": players, "fixture": fixture}
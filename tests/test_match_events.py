@@ -0,0 +1,100 @@
+import match_events
+from match_events import append_events, match_event
+
+
+def player_counters(client):
+    return {player["name"]: (player["goals_scored"], player["yellow_cards"], player["red_cards"])
+            for player in client.get("/api/players").json()}
+
+
+def ledger_balance(run, db, event_id):
+    async def balance():
+        return sum([entry["delta"] async for entry in db.match_events.find({"event_id": event_id})])
+    return run(balance)
+
+
+def fixture_goal_ids(client, fixture_id, side="home"):
+    return [goal["id"] for goal in client.get(f"/api/fixtures/{fixture_id}").json()["fixture"][f"{side}_scorers"]]
+
+
+def test_append_events_skips_recorded_entries(run, db, league):
+    event = match_event("liga", league["fixture"], "home", {"id": "g1", "player_id": league["players"][0]})
+    assert len(run(append_events, db, [dict(event)])) == 1
+    assert run(append_events, db, [dict(event)]) == []
+    assert ledger_balance(run, db, "g1") == 1
+
+
+def test_goal_and_card_routes_move_counters(client, admin, league):
+    fixture, (x, y) = league["fixture"], league["players"]
+    client.post(f"/api/fixtures/{fixture}/goals", json={"player_id": x, "team_side": "home"}, headers=admin)
+    client.post(f"/api/fixtures/{fixture}/goals", json={"player_id": x, "team_side": "home"}, headers=admin)
+    client.post(f"/api/fixtures/{fixture}/cards", json={"player_id": y, "team_side": "away", "card_type": "red"}, headers=admin)
+    assert player_counters(client) == {"x": (2, 0, 0), "y": (0, 0, 1)}
+
+    goal_id = fixture_goal_ids(client, fixture)[0]
+    response = client.request("DELETE", f"/api/fixtures/{fixture}/goals",
+                              json={"goal_id": goal_id, "team_side": "home"}, headers=admin)
+    assert response.status_code == 200
+    assert player_counters(client)["x"] == (1, 0, 0)
+
+    # Removing the same goal again is a 404 and leaves the counter alone
+    response = client.request("DELETE", f"/api/fixtures/{fixture}/goals",
+                              json={"goal_id": goal_id, "team_side": "home"}, headers=admin)
+    assert response.status_code == 404
+    assert player_counters(client)["x"] == (1, 0, 0)
+
+
+def test_removing_an_unrecorded_goal_nets_to_zero(client, admin, run, db, league):
+    fixture, x = league["fixture"], league["players"][0]
+
+    # A goal pushed to the fixture whose ledger append never happened
+    async def push_without_ledger():
+        await db.fixtures.update_one({"id": fixture}, {"$push": {"home_scorers": {"id": "lost", "player_id": x, "player_name": "x"}}})
+    run(push_without_ledger)
+
+    response = client.request("DELETE", f"/api/fixtures/{fixture}/goals",
+                              json={"goal_id": "lost", "team_side": "home"}, headers=admin)
+    assert response.status_code == 200
+    assert ledger_balance(run, db, "lost") == 0
+    assert player_counters(client)["x"] == (0, 0, 0)
+
+
+def test_deleting_a_fixture_voids_its_events(client, admin, run, db, league):
+    fixture, (x, y) = league["fixture"], league["players"]
+    client.post(f"/api/fixtures/{fixture}/goals", json={"player_id": x, "team_side": "home"}, headers=admin)
+    client.post(f"/api/fixtures/{fixture}/cards", json={"player_id": y, "team_side": "away", "card_type": "yellow"}, headers=admin)
+    goal_id = fixture_goal_ids(client, fixture)[0]
+
+    assert client.delete(f"/api/fixtures/{fixture}", headers=admin).status_code == 200
+    assert ledger_balance(run, db, goal_id) == 0
+    assert player_counters(client) == {"x": (0, 0, 0), "y": (0, 0, 0)}
+
+
+def test_reconcile_repairs_ledger_and_counters(client, admin, run, db, league):
+    fixture, (x, y) = league["fixture"], league["players"]
+    client.post(f"/api/fixtures/{fixture}/cards", json={"player_id": y, "team_side": "away", "card_type": "red"}, headers=admin)
+
+    async def corrupt():
+        # On a fixture without a ledger entry
+        await db.fixtures.update_one({"id": fixture}, {"$push": {"home_scorers": {"id": "unrecorded", "player_id": x, "player_name": "x"}}})
+        # In the ledger but on no fixture
+        await db.match_events.insert_one(match_event("liga", fixture, "away", {"id": "ghost", "player_id": y}))
+        # Voided without its addition
+        await db.match_events.insert_one(match_event("liga", fixture, "home", {"id": "negative", "player_id": x}, delta=-1))
+        # A card removed from the fixture without touching the ledger or the counter
+        await db.fixtures.update_one({"id": fixture}, {"$set": {"away_cards": []}})
+    run(corrupt)
+
+    report = run(match_events.reconcile, db)
+    assert report == {"events_added": 2, "events_voided": 2, "players_corrected": 2}
+    for event_id in ("unrecorded", "ghost", "negative"):
+        assert ledger_balance(run, db, event_id) == (1 if event_id == "unrecorded" else 0)
+    assert player_counters(client) == {"x": (1, 0, 0), "y": (0, 0, 0)}
+
+    # The corrected red card is reflected in the sanctions view
+    async def sanction_row():
+        return await db.sanctions.find_one({"player_id": y})
+    assert run(sanction_row)["total_red_cards"] == 0
+
+    # A second run finds nothing left to repair
+    assert run(match_events.reconcile, db) == {"events_added": 0, "events_voided": 0, "players_corrected": 0}
@@ -0,0 +1,37 @@
+def test_cursor_pages_cover_every_player(client, admin, league):
+    team = league["teams"][0]
+    for number in range(5):
+        client.post("/api/players", json={"name": f"p{number}", "team_id": team}, headers=admin)
+    expected = {player["id"] for player in client.get("/api/players").json()}
+
+    seen, cursor = [], None
+    while True:
+        response = client.get("/api/players", params={"limit": 2, "count": True, **({"after": cursor} if cursor else {})})
+        assert response.status_code == 200
+        assert response.headers["X-Total-Count"] == str(len(expected))
+        seen.extend(player["id"] for player in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert len(seen) == len(expected) == 7
+    assert set(seen) == expected
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/api/players", params={"after": "not-a-cursor"}).status_code == 400
+
+
+def test_etag_revalidation_and_invalidation_on_write(client, admin):
+    client.post("/api/teams", json={"name": "A", "division": 1}, headers=admin)
+    response = client.get("/api/teams")
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    assert client.get("/api/teams", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/api/teams", json={"name": "B", "division": 1}, headers=admin)
+    response = client.get("/api/teams", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert {team["name"] for team in response.json()} == {"A", "B"}
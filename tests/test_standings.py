@@ -0,0 +1,58 @@
+def standings(client, division=1):
+    return [
+        {key: value for key, value in row.items() if key != "position"}
+        for row in client.get(f"/api/standings/division/{division}").json()
+    ]
+
+
+def fixture(client, admin, home, away, week, division=1):
+    return client.post("/api/fixtures", json={
+        "division": division, "week_number": week, "home_team_id": home, "away_team_id": away,
+        "match_date": f"2025-09-{week + 5:02d}T17:00:00",
+    }, headers=admin).json()["id"]
+
+
+def result(client, admin, fixture_id, home_score, away_score, status="completed"):
+    response = client.put(f"/api/fixtures/{fixture_id}", json={
+        "home_score": home_score, "away_score": away_score, "status": status,
+    }, headers=admin)
+    assert response.status_code == 200
+
+
+def rebuilt(client, admin, division=1):
+    assert client.post("/api/standings/rebuild", headers=admin).status_code == 200
+    return standings(client, division)
+
+
+def test_incremental_standings_match_a_rebuild(client, admin, league):
+    a, b = league["teams"]
+    c = client.post("/api/teams", json={"name": "C", "division": 1}, headers=admin).json()["id"]
+    first = league["fixture"]
+    second, third = fixture(client, admin, b, c, 2), fixture(client, admin, c, a, 3)
+
+    result(client, admin, first, 2, 1)
+    result(client, admin, second, 0, 0)
+    result(client, admin, third, 3, 1)
+    # Corrected scores and a result taken back out of the table
+    result(client, admin, first, 1, 1)
+    result(client, admin, second, 0, 0, status="scheduled")
+
+    incremental = standings(client)
+    assert {row["team_name"]: (row["games_played"], row["points"]) for row in incremental} == {
+        "A": (2, 1), "B": (1, 1), "C": (1, 3),
+    }
+    assert rebuilt(client, admin) == incremental
+
+
+def test_moving_and_deleting_teams_match_a_rebuild(client, admin, league):
+    a, b = league["teams"]
+    result(client, admin, league["fixture"], 2, 0)
+
+    # A moved to division 2 no longer counts against B in division 1
+    client.put(f"/api/teams/{a}", json={"name": "A", "division": 2}, headers=admin)
+    assert standings(client) == rebuilt(client, admin)
+    assert standings(client, 2) == rebuilt(client, admin, 2)
+    assert [row["team_name"] for row in standings(client, 2)] == ["A"]
+
+    assert client.delete(f"/api/teams/{b}", headers=admin).status_code == 200
+    assert standings(client) == rebuilt(client, admin) == []